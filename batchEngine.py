@@ -0,0 +1,305 @@
+from typing import Callable, Literal, Optional
+
+import numpy as np
+
+from boardCorpus import BoardCorpus, finalize_first_click
+from boardGenerator import generate_boards, neighbor_counts
+from gameState import GameState
+from models import FieldValue
+
+ONGOING, WIN, LOSS = 0, 1, -1
+
+# Draws of `random_batch_move` before it falls back to ranking the undiscovered fields of a board
+RANDOM_MOVE_DRAWS = 4
+
+# Batched strategy: observation of shape (boards, rows, columns) -> field ids, optionally with a flag mask
+BatchStrategy = Callable[
+    [np.ndarray, "BatchMineSweeper"],
+    np.ndarray | tuple[np.ndarray, np.ndarray]
+]
+
+
+def _pack_rows(mask: np.ndarray, words: int) -> np.ndarray:
+    """Pack a stack of boolean boards into uint64 words per row, column `c` is bit `c % 64` of word `c // 64`."""
+    # Padding every row to whole words first lets one flat packbits call do all rows
+    padded = np.zeros(mask.shape[:-1] + (words * 64,), dtype=bool)
+    padded[..., :mask.shape[-1]] = mask
+    return np.packbits(padded.reshape(-1), bitorder="little").view("<u8").reshape(mask.shape[:-1] + (words,))
+
+
+def _unpack_rows(packed: np.ndarray, columns: int) -> np.ndarray:
+    """Inverse of `_pack_rows`."""
+    unpacked = np.unpackbits(packed.reshape(-1).view(np.uint8), bitorder="little").view(bool)
+    return unpacked.reshape(packed.shape[:-1] + (-1,))[..., :columns]
+
+
+def _dilate(rows: np.ndarray, out: np.ndarray, scratch: np.ndarray, column_mask: np.ndarray) -> np.ndarray:
+    """
+    Grow a stack of packed boards by their 8-neighborhood (separable, columns then rows).
+
+    :param rows: Boards packed by `_pack_rows`, shape (boards, rows, words)
+    :param out: Buffer of the same shape receiving the result, must not be `rows`
+    :param scratch: Buffer of the same shape for the intermediate result
+    :param column_mask: Per word the bits of existing columns, clears what is shifted off the board
+    :return: `out`
+    """
+    np.left_shift(rows, 1, out=scratch)
+    scratch |= rows
+    scratch |= np.right_shift(rows, 1, out=out)
+    if rows.shape[-1] > 1:
+        # Carry the bits shifted across word boundaries
+        scratch[..., 1:] |= np.right_shift(rows[..., :-1], 63, out=out[..., :-1])
+        scratch[..., :-1] |= np.left_shift(rows[..., 1:], 63, out=out[..., 1:])
+    scratch &= column_mask
+
+    np.copyto(out, scratch)
+    out[:, 1:] |= scratch[:, :-1]
+    out[:, :-1] |= scratch[:, 1:]
+    return out
+
+
+class BatchMineSweeper:
+    """
+    Vectorized simulator playing many boards of the same size at once.
+
+    All boards are stored as stacked NumPy arrays (mine masks, neighbor counts, revealed and
+    flag masks) and every `step` applies one move per board. Strategies receive the observation
+    of all boards as one int8 array of FieldValue codes and return one field id per board.
+    Like on minesweeperonline the first click of every board is never a mine.
+
+    Attributes:
+        mines: Mine masks, shape (boards, rows, columns)
+        adjacent_mines: Number of neighboring mines per field, shape (boards, rows, columns)
+        revealed: Revealed masks, shape (boards, rows, columns)
+        flagged: Flag masks, shape (boards, rows, columns)
+        observation: FieldValue codes a player sees, shape (boards, rows, columns)
+        status: Per board ONGOING, WIN or LOSS
+        moves_made: Moves applied per board
+        safe_fields_left: Per board number of safe fields that are not revealed yet
+    """
+
+    def __init__(
+            self,
+            boards: int,
+            difficulty: Literal["beginner", "intermediate", "expert"] = "beginner",
+            custom: Optional[tuple[int, int, int]] = None,
+            seed: Optional[int] = None,
+            corpus: Optional[BoardCorpus] = None,
+    ) -> None:
+        """
+        :param boards: Number of boards simulated in parallel
+        :param difficulty: Game difficulty level
+        :param custom: Custom dimensions (columns, rows, mines) to override difficulty
+        :param seed: Seed of the board set, random if None. Board `i` is board `i` of
+            `boardGenerator.generate_boards`, the same one `HeadlessMineSweeper` plays as game `i`
+        :param corpus: Play the first `boards` boards of a stored corpus instead of generating them,
+            overrides difficulty and custom
+        """
+        if corpus is not None:
+            if boards > len(corpus):
+                raise ValueError(f"Corpus has {len(corpus)} boards, {boards} requested")
+            self.columns, self.rows, self.total_mines = corpus.size
+        else:
+            self.columns, self.rows, self.total_mines = custom if custom else GameState.DIFFICULTY_TO_SIZE[difficulty]
+        if not 0 < self.total_mines < self.rows * self.columns:
+            raise ValueError(f"Cannot place {self.total_mines} mines on a {self.columns}x{self.rows} board")
+
+        self.boards = boards
+        self.corpus = corpus
+        self.rng = np.random.default_rng(seed)
+        self.seed = seed if seed is not None else int(self.rng.integers(2 ** 63))
+
+        shape = (boards, self.rows, self.columns)
+        self.mines = np.zeros(shape, dtype=bool)
+        self.adjacent_mines = np.zeros(shape, dtype=np.int8)
+        self.revealed = np.zeros(shape, dtype=bool)
+        self.flagged = np.zeros(shape, dtype=bool)
+        self.observation = np.full(shape, FieldValue.UNDISCOVERED.value, dtype=np.int8)
+        self.placed = np.zeros(boards, dtype=bool)
+        self.status = np.full(boards, ONGOING, dtype=np.int8)
+        self.moves_made = np.zeros(boards, dtype=np.int32)
+        self.safe_fields_left = np.full(boards, self.rows * self.columns - self.total_mines, dtype=np.int32)
+        self.steps = 0
+        # The flood fill works on rows packed into uint64 words, its scratch masks are allocated once
+        self._words = -(-self.columns // 64)
+        self._column_mask = _pack_rows(np.ones(self.columns, dtype=bool), self._words)
+        self._empty_rows = np.zeros((boards, self.rows, self._words), dtype=np.uint64)
+        self._grown = np.empty_like(self._empty_rows)
+        self._dilate_scratch = np.empty_like(self._grown)
+
+    def observe(self) -> np.ndarray:
+        """
+        Return what a player sees on every board.
+
+        The observation is maintained incrementally by `step`, so this is free; treat the
+        returned array as read-only.
+
+        :return: int8 array of FieldValue codes with shape (boards, rows, columns)
+        """
+        return self.observation
+
+    def _place_mines(self, boards: np.ndarray, first_clicks: np.ndarray) -> None:
+        """Place mines on the given boards, never on their first clicked field."""
+        if self.corpus is not None:
+            mines = finalize_first_click(self.corpus.boards(boards), first_clicks)
+        else:
+            mines = generate_boards(self.seed, boards, self.columns, self.rows, self.total_mines, first_clicks)
+        self.mines[boards] = mines
+        self.adjacent_mines[boards] = adjacent_mines = neighbor_counts(mines)
+        self._empty_rows[boards] = _pack_rows((adjacent_mines == 0) & ~mines, self._words)
+        self.placed[boards] = True
+
+    def _flood_reveal(self, boards: np.ndarray, rows: np.ndarray, columns: np.ndarray) -> None:
+        """Reveal the clicked empty fields and flood-fill from them, in all boards at once."""
+        # The fill only spreads from empty fields, so it never reaches a mine. Revealed fields block
+        # it too, their neighbors were opened when they were revealed
+        blocked = self.flagged[boards] | self.revealed[boards]
+        openable = _pack_rows(~blocked, self._words)
+        frontier = np.zeros_like(openable)
+        clicked = (np.arange(boards.size), rows, columns // 64)
+        frontier[clicked] = np.left_shift(np.uint64(1), (columns % 64).astype(np.uint64))
+        openable[clicked] &= ~frontier[clicked]
+
+        # Only boards whose flood fill is still spreading take part in the next round, the fill
+        # works on compacted copies of their masks and writes a board back once it stops
+        spreading = np.arange(boards.size)
+        spreading_openable = openable
+        spreading_empty = self._empty_rows[boards]
+        while spreading.size:
+            count = spreading.size
+            grown = _dilate(frontier, self._grown[:count], self._dilate_scratch[:count], self._column_mask)
+            grown &= spreading_openable
+            spreading_openable ^= grown
+            frontier = grown & spreading_empty
+
+            still_spreading = frontier.any(axis=(1, 2))
+            if not still_spreading.all():
+                stopped = ~still_spreading
+                openable[spreading[stopped]] = spreading_openable[stopped]
+                spreading = spreading[still_spreading]
+                spreading_openable = spreading_openable[still_spreading]
+                spreading_empty = spreading_empty[still_spreading]
+                frontier = frontier[still_spreading]
+
+        opened = ~(_unpack_rows(openable, self.columns) | blocked)
+        self.revealed[boards] |= opened
+        observation = self.observation[boards]
+        np.copyto(observation, self.adjacent_mines[boards], where=opened)
+        self.observation[boards] = observation
+        self.safe_fields_left[boards] -= opened.sum(axis=(1, 2), dtype=np.int32)
+
+    def step(self, field_ids: np.ndarray, flag: Optional[np.ndarray] = None) -> None:
+        """
+        Apply one move per board.
+
+        :param field_ids: Field id (col + row * columns) per board, negative ids skip the board
+        :param flag: Per board whether the move toggles a flag instead of clicking
+        """
+        field_ids = np.asarray(field_ids)
+
+        active = (self.status == ONGOING) & (field_ids >= 0)
+        self.moves_made += active
+        self.steps += 1
+
+        # Flags
+        if flag is not None:
+            flag = np.asarray(flag, dtype=bool)
+            flagging = np.flatnonzero(active & flag)
+            if flagging.size:
+                r, c = np.divmod(field_ids[flagging], self.columns)
+                toggle = ~self.revealed[flagging, r, c]
+                flagging, r, c = flagging[toggle], r[toggle], c[toggle]
+                self.flagged[flagging, r, c] ^= True
+                self.observation[flagging, r, c] = np.where(
+                    self.flagged[flagging, r, c], FieldValue.FLAGGED.value, FieldValue.UNDISCOVERED.value
+                )
+            active &= ~flag
+
+        # Clicks on undiscovered, unflagged fields
+        clicking = np.flatnonzero(active)
+        r, c = np.divmod(field_ids[clicking], self.columns)
+        valid = ~self.revealed[clicking, r, c] & ~self.flagged[clicking, r, c]
+        clicking, r, c = clicking[valid], r[valid], c[valid]
+        if not clicking.size:
+            return
+
+        first = ~self.placed[clicking]
+        if first.any():
+            self._place_mines(clicking[first], (r * self.columns + c)[first])
+
+        hit = self.mines[clicking, r, c]
+        self.status[clicking[hit]] = LOSS
+
+        safe = ~hit
+        boards, r, c = clicking[safe], r[safe], c[safe]
+        if not boards.size:
+            return
+
+        # A number only reveals itself, only empty fields need the flood fill
+        counts = self.adjacent_mines[boards, r, c]
+        empty = counts == 0
+        numbers = ~empty
+        self.revealed[boards[numbers], r[numbers], c[numbers]] = True
+        self.observation[boards[numbers], r[numbers], c[numbers]] = counts[numbers]
+        self.safe_fields_left[boards[numbers]] -= 1
+        if empty.any():
+            self._flood_reveal(boards[empty], r[empty], c[empty])
+
+        self.status[boards[self.safe_fields_left[boards] == 0]] = WIN
+
+    def run(self, strategy: BatchStrategy, max_steps: Optional[int] = None) -> dict[str, any]:
+        """
+        Step all boards with `strategy` until every game is won or lost.
+
+        :param strategy: Callable taking (observation, engine) and returning field ids per board,
+            or a tuple of (field ids, flag mask)
+        :param max_steps: Stop after this many steps even if games are still ongoing
+        :return: Dictionary with games, wins, losses, unfinished games, win rate, moves and steps
+        """
+        while (self.status == ONGOING).any() and (max_steps is None or self.steps < max_steps):
+            action = strategy(self.observe(), self)
+            if isinstance(action, tuple):
+                self.step(*action)
+            else:
+                self.step(action)
+
+        wins = int((self.status == WIN).sum())
+        losses = int((self.status == LOSS).sum())
+        return {
+            "games_played": self.boards,
+            "wins": wins,
+            "losses": losses,
+            "unfinished": self.boards - wins - losses,
+            "win_rate": wins / self.boards,
+            "moves": {
+                "total_moves": int(self.moves_made.sum()),
+                "avg_moves_win": round(float(self.moves_made[self.status == WIN].mean()) if wins else 0, 3),
+                "avg_moves_loss": round(float(self.moves_made[self.status == LOSS].mean()) if losses else 0, 3),
+            },
+            "steps": self.steps,
+        }
+
+
+def random_batch_move(observation: np.ndarray, engine: BatchMineSweeper) -> np.ndarray:
+    """Batched counterpart of the random `next_move` in `main.py`: click a random undiscovered field per board."""
+    field_ids = np.full(observation.shape[0], -1)
+    fields = observation.reshape(observation.shape[0], -1)
+
+    # Draw one field per board and redraw where it is not undiscovered, which stays uniform
+    # and rarely takes more than a round while most of a board is still undiscovered
+    drawing = np.flatnonzero(engine.status == ONGOING)
+    for _ in range(RANDOM_MOVE_DRAWS):
+        if not drawing.size:
+            return field_ids
+        drawn = engine.rng.integers(fields.shape[1], size=drawing.size)
+        hit = fields[drawing, drawn] == FieldValue.UNDISCOVERED.value
+        field_ids[drawing[hit]] = drawn[hit]
+        drawing = drawing[~hit]
+
+    # Boards that are mostly discovered get a random rank into their undiscovered fields
+    undiscovered = fields[drawing] == FieldValue.UNDISCOVERED.value
+    running_count = np.cumsum(undiscovered, axis=1, dtype=np.int32)
+    available = running_count[:, -1]
+    rank = (engine.rng.random(drawing.size) * available).astype(np.int32)
+    field_ids[drawing] = np.where(available > 0, (running_count > rank[:, None]).argmax(axis=1), -1)
+    return field_ids
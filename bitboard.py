@@ -0,0 +1,166 @@
+from typing import Iterator, TYPE_CHECKING
+
+import numpy as np
+
+from models import FieldValue
+
+if TYPE_CHECKING:
+    from gameState import GameState
+
+UNDISCOVERED_CODE = FieldValue.UNDISCOVERED.value
+FLAGGED_CODE = FieldValue.FLAGGED.value
+
+
+def neighbor_stencils(columns: int) -> tuple[int, ...]:
+    """
+    3x3 neighborhood mask of a field in every column, relative to the field's upper left neighbor.
+
+    Shifting the stencil of a field's column by `field_id - columns - 1` gives the field's
+    neighbor mask. The stencils of the first and last column leave out the column that would
+    wrap around to the neighboring row.
+
+    :param columns: Number of columns of the board
+    :return: One stencil per column
+    """
+    stencils = []
+    for column in range(columns):
+        window_columns = [offset for offset, exists in enumerate((column > 0, True, column < columns - 1)) if exists]
+        stencils.append(sum(
+            1 << (window_row * columns + window_column)
+            for window_row in range(3) for window_column in window_columns
+            if (window_row, window_column) != (1, 1)
+        ))
+    return tuple(stencils)
+
+
+def _mask_from_bools(bits: np.ndarray) -> int:
+    """Pack a boolean array indexed by field id into an int bitset."""
+    return int.from_bytes(np.packbits(bits, bitorder="little").tobytes(), "little")
+
+
+def iter_bits(mask: int) -> Iterator[int]:
+    """Yield the field ids of the set bits of `mask`, lowest first."""
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class BitBoard:
+    """
+    Board state as Python int bitsets, bit `i` standing for field id `i`.
+
+    Set operations on whole boards become single int operations, and questions a constraint
+    solver asks for every number, like the number of unknown fields or flags around it, are
+    one AND with the number's neighbor mask plus `int.bit_count()`. Neighbor masks are
+    shifted from a per-column stencil on demand, a board-wide mask per field would take
+    memory quadratic in the board size.
+
+    Attributes:
+        columns, rows: Board dimensions
+        full: Mask with the bit of every field set
+        undiscovered: Fields that are neither revealed nor flagged
+        flagged: Flagged fields
+        numbers: Revealed fields by their number of adjacent mines, `numbers[0]` are empty fields
+    """
+
+    __slots__ = (
+        "columns", "rows", "full", "_stencils", "_codes", "_not_first_column", "_not_last_column",
+        "undiscovered", "flagged", "numbers",
+    )
+
+    def __init__(self, columns: int, rows: int) -> None:
+        """Create an undiscovered board."""
+        self.columns, self.rows = columns, rows
+        self.full = (1 << (columns * rows)) - 1
+        self._stencils = neighbor_stencils(columns)
+        # FieldValue code of every field, so `set` knows which bitset a field leaves
+        self._codes = [UNDISCOVERED_CODE] * (columns * rows)
+
+        # Shifting by one bit moves fields across row ends, these masks cut the wrapped bits off
+        first_column = sum(1 << (row * columns) for row in range(rows))
+        self._not_first_column = self.full & ~first_column
+        self._not_last_column = self.full & ~(first_column << (columns - 1))
+
+        self.undiscovered = self.full
+        self.flagged = 0
+        self.numbers = [0] * 9
+
+    @classmethod
+    def from_state(cls, state: "GameState") -> "BitBoard":
+        """Build the bitsets of a game's current board from its `values` array."""
+        bitboard = cls(state.columns, state.rows)
+        values = state.values
+        bitboard._codes = values.tolist()
+        bitboard.undiscovered = _mask_from_bools(values == FieldValue.UNDISCOVERED.value)
+        bitboard.flagged = _mask_from_bools(values == FieldValue.FLAGGED.value)
+        bitboard.numbers = [_mask_from_bools(values == number) for number in range(9)]
+        return bitboard
+
+    @property
+    def revealed(self) -> int:
+        """Fields showing a number or empty."""
+        return self.full & ~(self.undiscovered | self.flagged)
+
+    def set(self, field_id: int, code: int) -> None:
+        """
+        Move a field to a new value, e.g. for every field in a game's `change_log`.
+
+        :param field_id: Field id
+        :param code: FieldValue code the field has now
+        """
+        old_code = self._codes[field_id]
+        if code == old_code:
+            return
+        self._codes[field_id] = code
+        bit = 1 << field_id
+        self._clear(bit, old_code)
+        if code == UNDISCOVERED_CODE:
+            self.undiscovered |= bit
+        elif code == FLAGGED_CODE:
+            self.flagged |= bit
+        else:
+            self.numbers[code] |= bit
+
+    def _clear(self, bit: int, code: int) -> None:
+        if code == UNDISCOVERED_CODE:
+            self.undiscovered &= ~bit
+        elif code == FLAGGED_CODE:
+            self.flagged &= ~bit
+        else:
+            self.numbers[code] &= ~bit
+
+    def neighbor_mask(self, field_id: int) -> int:
+        """Mask of the up to 8 neighbors of a field."""
+        shift = field_id - self.columns - 1
+        stencil = self._stencils[field_id % self.columns]
+        # Above the first row the shift is negative, the bits of the missing row fall off
+        return (stencil << shift if shift >= 0 else stencil >> -shift) & self.full
+
+    def unknown_around(self, field_id: int) -> int:
+        """Mask of the undiscovered neighbors of a field."""
+        return self.neighbor_mask(field_id) & self.undiscovered
+
+    def count_unknown_around(self, field_id: int) -> int:
+        """Number of undiscovered neighbors of a field."""
+        return (self.neighbor_mask(field_id) & self.undiscovered).bit_count()
+
+    def count_flags_around(self, field_id: int) -> int:
+        """Number of flagged neighbors of a field."""
+        return (self.neighbor_mask(field_id) & self.flagged).bit_count()
+
+    def numbers_around(self, field_id: int) -> int:
+        """Mask of the neighbors of a field that show a number (1-8)."""
+        return self.neighbor_mask(field_id) & ~(self.undiscovered | self.flagged | self.numbers[0])
+
+    def dilate(self, mask: int) -> int:
+        """Grow a mask by the 8-neighborhood of its fields with shifts instead of per-field masks."""
+        horizontal = mask | ((mask << 1) & self._not_first_column) | ((mask >> 1) & self._not_last_column)
+        return (horizontal | (horizontal << self.columns) | (horizontal >> self.columns)) & self.full
+
+    def frontier(self) -> int:
+        """Mask of the revealed numbers (1-8) that still border an undiscovered field."""
+        numbers = 0
+        for mask in self.numbers[1:]:
+            numbers |= mask
+        return numbers & self.dilate(self.undiscovered)
@@ -0,0 +1,126 @@
+import struct
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+
+from boardGenerator import CHUNK_BOARDS, generate_boards
+
+# Header: magic, version, columns, rows, mines, board count, seed, reserved
+HEADER = struct.Struct("<4sHHHIQQ2x")
+MAGIC = b"MSWC"
+VERSION = 1
+
+
+def finalize_first_click(mines: np.ndarray, first_clicks: Sequence[int] | np.ndarray | int) -> np.ndarray:
+    """
+    Make stored layouts safe on the first click.
+
+    Corpus boards are stored before the first click, so a first click on a mine moves that
+    mine to the first free field in row-major order (like classic Windows Minesweeper). The
+    rule is deterministic, so every strategy clicking the same field plays the same board.
+
+    :param mines: Mine masks of shape (boards, rows, columns) or (rows, columns)
+    :param first_clicks: Field id of the first click per board, or one for all
+    :return: Finalized copy of the mine masks
+    """
+    finalized = np.array(mines, dtype=bool)
+    flat = finalized.reshape(-1, finalized.shape[-2] * finalized.shape[-1])
+    first_clicks = np.broadcast_to(np.asarray(first_clicks, dtype=np.intp), flat.shape[:1])
+
+    hit = np.flatnonzero(flat[np.arange(flat.shape[0]), first_clicks])
+    if hit.size:
+        flat[hit, first_clicks[hit]] = False
+        free = ~flat[hit]
+        free[np.arange(hit.size), first_clicks[hit]] = False
+        flat[hit, free.argmax(axis=1)] = True
+
+    return finalized
+
+
+def write_corpus(
+        path: Path | str,
+        seed: int,
+        count: int,
+        columns: int,
+        rows: int,
+        mines: int,
+) -> None:
+    """
+    Generate a corpus of `count` boards with `boardGenerator` and write it to `path`.
+
+    Boards are stored one bit per field (row-major, padded to whole bytes per board) after
+    a small header, and written in chunks so corpora larger than memory can be built.
+
+    :param path: Output file
+    :param seed: Seed of the board set
+    :param count: Number of boards
+    :param columns: Number of columns of the board
+    :param rows: Number of rows of the board
+    :param mines: Number of mines per board
+    """
+    with open(path, "wb") as corpus:
+        corpus.write(HEADER.pack(MAGIC, VERSION, columns, rows, mines, count, seed))
+        for start in range(0, count, CHUNK_BOARDS):
+            indices = np.arange(start, min(start + CHUNK_BOARDS, count))
+            layouts = generate_boards(seed, indices, columns, rows, mines, first_clicks=None)
+            corpus.write(np.packbits(layouts.reshape(indices.size, -1), axis=1).tobytes())
+
+
+class BoardCorpus:
+    """
+    Memory-mapped read access to a corpus written by `write_corpus`.
+
+    Opening a corpus only reads the header; board data is paged in on access and shared
+    through the page cache by every process that maps the same file.
+
+    Attributes:
+        columns, rows, total_mines: Board dimensions of every board in the corpus
+        seed: Seed the corpus was generated with
+        path: Corpus file
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        """
+        :param path: Corpus file
+        :raises ValueError: If the file is not a corpus or has an unsupported version
+        """
+        self.path = Path(path)
+        with open(self.path, "rb") as corpus:
+            header = corpus.read(HEADER.size)
+        if len(header) < HEADER.size:
+            raise ValueError(f"{self.path} is too small to be a board corpus")
+
+        magic, version, self.columns, self.rows, self.total_mines, count, self.seed = HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path} is not a board corpus")
+        if version != VERSION:
+            raise ValueError(f"Unsupported board corpus version {version}")
+
+        self.bytes_per_board = (self.rows * self.columns + 7) // 8
+        self._data = np.memmap(
+            self.path, dtype=np.uint8, mode="r", offset=HEADER.size, shape=(count, self.bytes_per_board)
+        ) if count else np.zeros((0, self.bytes_per_board), dtype=np.uint8)
+
+    @property
+    def size(self) -> tuple[int, int, int]:
+        """Board dimensions as (columns, rows, mines), like `custom`."""
+        return self.columns, self.rows, self.total_mines
+
+    def __len__(self) -> int:
+        return self._data.shape[0]
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Return board `index` as mine mask of shape (rows, columns), not finalized."""
+        return self.boards([index])[0]
+
+    def boards(self, indices: Sequence[int] | np.ndarray) -> np.ndarray:
+        """
+        Unpack several boards at once.
+
+        :param indices: Board indices
+        :return: Mine masks of shape (boards, rows, columns), not finalized
+        """
+        cells = self.rows * self.columns
+        packed = self._data[np.asarray(indices, dtype=np.intp)]
+        return np.unpackbits(packed, axis=1, count=cells).astype(bool).reshape(-1, self.rows, self.columns)
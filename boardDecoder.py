@@ -0,0 +1,125 @@
+from typing import Optional, Sequence
+
+import numpy as np
+from mss.screenshot import ScreenShot
+
+from models import FieldValue, Point
+
+UNDISCOVERED_CODE = FieldValue.UNDISCOVERED.value
+
+
+def pack_rgb(pixels: np.ndarray) -> np.ndarray:
+    """Pack BGR(A) pixels of shape (..., 3|4) into 24-bit 0xRRGGBB integers."""
+    pixels = pixels.astype(np.uint32, copy=False)
+    return (pixels[..., 2] << 16) | (pixels[..., 1] << 8) | pixels[..., 0]
+
+
+class ColorLookupTable:
+    """
+    Lookup table mapping packed 24-bit colors to FieldValue codes.
+
+    The palette is stored as a sorted array of packed colors, so a whole array of sampled
+    pixels is classified with a single `searchsorted` instead of building and hashing an
+    RGB tuple per pixel.
+
+    Attributes:
+        keys: Sorted packed 0xRRGGBB colors of the palette
+        codes: FieldValue codes belonging to each key
+        default: Code returned for colors missing from the palette
+    """
+
+    def __init__(
+            self,
+            color_map: dict[tuple[int, int, int], FieldValue],
+            default: FieldValue = FieldValue.EMPTY,
+    ) -> None:
+        """
+        :param color_map: Mapping of RGB colors to field values
+        :param default: Field value for colors that are not in the color map
+        """
+        packed = np.array([(r << 16) | (g << 8) | b for r, g, b in color_map], dtype=np.uint32)
+        order = np.argsort(packed)
+        self.keys = packed[order]
+        self.codes = np.array([value.value for value in color_map.values()], dtype=np.int8)[order]
+        self.default = np.int8(default.value)
+
+    def classify(self, pixels: np.ndarray) -> np.ndarray:
+        """
+        Map an array of BGR(A) pixels to FieldValue codes.
+
+        :param pixels: Array of shape (..., 3) or (..., 4) in BGR(A) order
+        :return: int8 array of FieldValue codes with the pixels' leading shape
+        """
+        packed = pack_rgb(pixels)
+        if not self.keys.size:
+            return np.full(packed.shape, self.default, dtype=np.int8)
+
+        idx = np.searchsorted(self.keys, packed)
+        idx = np.minimum(idx, self.keys.size - 1)
+        return np.where(self.keys[idx] == packed, self.codes[idx], self.default)
+
+
+class BoardDecoder:
+    """
+    Vectorized decoder that classifies every field of a captured board image in one pass.
+
+    Instead of calling `ScreenShot.pixel()` twice per field, the decoder precomputes the
+    pixel indices of each field's border and center sample once, gathers all of them from
+    the raw BGRA buffer with fancy indexing and classifies them with a `ColorLookupTable`.
+
+    Attributes:
+        border_x, border_y: Pixel coordinates (relative to the board image) of each field's border sample
+        center_x, center_y: Pixel coordinates (relative to the board image) of each field's center sample
+        color_lut: Lookup table classifying sampled pixels
+    """
+
+    def __init__(
+            self,
+            centers: Sequence[Point],
+            border_offset: int,
+            color_lut: ColorLookupTable,
+    ) -> None:
+        """
+        :param centers: Field centers relative to the board image, ordered by field id
+        :param border_offset: Offset from the field center to the upper edge sample
+        :param color_lut: Lookup table built from the solver's color map
+        """
+        centers = np.asarray(centers, dtype=np.intp).reshape(-1, 2)
+        self.center_x = centers[:, 0]
+        self.center_y = centers[:, 1]
+        self.border_x = self.center_x
+        self.border_y = self.center_y - border_offset
+        self.color_lut = color_lut
+
+    @staticmethod
+    def as_array(screenshot: ScreenShot) -> np.ndarray:
+        """Wrap the BGRA buffer of a mss screenshot as a (height, width, 4) array without copying."""
+        return np.frombuffer(screenshot.raw, dtype=np.uint8).reshape(screenshot.height, screenshot.width, 4)
+
+    def decode(
+            self,
+            image: np.ndarray,
+            ids: Optional[np.ndarray] = None,
+            offset: Point = Point(0, 0),
+    ) -> np.ndarray:
+        """
+        Classify the fields of a board image.
+
+        A field whose border still has the undiscovered color is reported as UNDISCOVERED,
+        every other field is classified by its center color.
+
+        :param image: Board image of shape (height, width, 4) in BGRA order
+        :param ids: Field ids to decode, all fields if None
+        :param offset: Position of the image's top left pixel within the full board image,
+            used when only a part of the board was captured
+        :return: int8 array of FieldValue codes, indexed by field id (or aligned with `ids`)
+        """
+        if ids is None:
+            center_x, center_y, border_x, border_y = self.center_x, self.center_y, self.border_x, self.border_y
+        else:
+            center_x, center_y = self.center_x[ids] - offset.x, self.center_y[ids] - offset.y
+            border_x, border_y = self.border_x[ids] - offset.x, self.border_y[ids] - offset.y
+
+        border_codes = self.color_lut.classify(image[border_y, border_x])
+        center_codes = self.color_lut.classify(image[center_y, center_x])
+        return np.where(border_codes == UNDISCOVERED_CODE, np.int8(UNDISCOVERED_CODE), center_codes)
@@ -0,0 +1,100 @@
+from typing import Optional, Sequence
+
+import numpy as np
+
+# Boards generated per vectorized chunk, bounds the memory of the sort keys (~250 MB on expert)
+CHUNK_BOARDS = 65536
+
+
+def neighbor_counts(mines: np.ndarray) -> np.ndarray:
+    """
+    Count the mines around every field with a separable 3x3 box convolution.
+
+    :param mines: Mine masks of shape (..., rows, columns)
+    :return: int8 array of the same shape with the number of neighboring mines
+    """
+    grid = mines.astype(np.int8)
+    rows_summed = grid.copy()
+    rows_summed[..., 1:, :] += grid[..., :-1, :]
+    rows_summed[..., :-1, :] += grid[..., 1:, :]
+
+    total = rows_summed.copy()
+    total[..., 1:] += rows_summed[..., :-1]
+    total[..., :-1] += rows_summed[..., 1:]
+    return total - grid
+
+
+def _sort_keys(seed: int, indices: np.ndarray, cells: int) -> np.ndarray:
+    """
+    Draw the random sort keys of the given boards.
+
+    Board `i` of a seed always uses the doubles `i * cells` to `(i + 1) * cells` of the PCG64
+    stream of that seed. Runs of consecutive indices are drawn with one call after jumping
+    ahead with `PCG64.advance`, so any subset of boards is generated in O(boards) time and
+    gives the same result in every process.
+    """
+    keys = np.empty((indices.size, cells))
+    run_starts = np.flatnonzero(np.diff(indices, prepend=indices[:1] - 2) != 1)
+    run_stops = np.append(run_starts[1:], indices.size)
+
+    for run_start, run_stop in zip(run_starts.tolist(), run_stops.tolist()):
+        bit_generator = np.random.PCG64(seed)
+        bit_generator.advance(int(indices[run_start]) * cells)
+        keys[run_start:run_stop] = np.random.Generator(bit_generator).random((run_stop - run_start, cells))
+
+    return keys
+
+
+def generate_boards(
+        seed: int,
+        indices: Sequence[int] | np.ndarray,
+        columns: int,
+        rows: int,
+        mines: int,
+        first_clicks: Optional[Sequence[int] | np.ndarray | int],
+) -> np.ndarray:
+    """
+    Generate reproducible mine layouts that are safe on the first click.
+
+    Every field of a board gets a random key and the `mines` fields with the smallest keys
+    become mines. Like on minesweeperonline the layout is finalized on the first click: the
+    clicked field's key is moved past all others, so it is never a mine.
+
+    :param seed: Seed of the board set
+    :param indices: Indices of the boards within the set
+    :param columns: Number of columns of the board
+    :param rows: Number of rows of the board
+    :param mines: Number of mines per board
+    :param first_clicks: Field id (col + row * columns) of the first click per board, or one for all.
+        None generates layouts that are not finalized yet (every field can be a mine)
+    :return: Boolean mine masks of shape (boards, rows, columns)
+    :raises ValueError: If the mines do not fit next to the first click
+    """
+    cells = rows * columns
+    if not 0 < mines < cells:
+        raise ValueError(f"Cannot place {mines} mines on a {columns}x{rows} board")
+
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    if first_clicks is not None:
+        first_clicks = np.broadcast_to(np.asarray(first_clicks, dtype=np.intp), indices.shape)
+    layouts = np.zeros((indices.size, cells), dtype=bool)
+
+    for start in range(0, indices.size, CHUNK_BOARDS):
+        stop = min(start + CHUNK_BOARDS, indices.size)
+        keys = _sort_keys(seed, indices[start:stop], cells)
+        if first_clicks is not None:
+            keys[np.arange(stop - start), first_clicks[start:stop]] = 2.0  # Sorts after every other field
+
+        mine_ids = np.argpartition(keys, mines - 1, axis=1)[:, :mines]
+        np.put_along_axis(layouts[start:stop], mine_ids, True, axis=1)
+
+    return layouts.reshape(-1, rows, columns)
+
+
+def generate_board(seed: int, index: int, columns: int, rows: int, mines: int, first_click: int) -> np.ndarray:
+    """
+    Generate a single board, identical to board `index` of `generate_boards`.
+
+    :return: Boolean mine mask of shape (rows, columns)
+    """
+    return generate_boards(seed, [index], columns, rows, mines, first_click)[0]
@@ -0,0 +1,69 @@
+import json
+from pathlib import Path
+from typing import Optional
+
+from models import Point
+
+CACHE_PATH = Path(__file__).parent / ".calibration_cache.json"
+
+
+def layout_key(monitors: list[dict[str, int]], size: tuple[int, int, int]) -> str:
+    """
+    Build the cache key for a screen layout and board size.
+
+    :param monitors: mss monitor dicts (left, top, width, height) of the physical monitors
+    :param size: Board dimensions (columns, rows, mines)
+    :return: Key identifying the geometry in the cache file
+    """
+    screens = ";".join(
+        f"{monitor['left']},{monitor['top']},{monitor['width']}x{monitor['height']}"
+        for monitor in monitors
+    )
+    columns, rows, mines = size
+    return f"{screens}|{columns}x{rows}x{mines}"
+
+
+def _read_cache(path: Path) -> dict[str, dict[str, list[int]]]:
+    try:
+        return json.loads(path.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def load_geometry(key: str, path: Path = CACHE_PATH) -> Optional[tuple[Point, Point]]:
+    """
+    Look up cached geometry.
+
+    :param key: Key returned by `layout_key`
+    :param path: Cache file
+    :return: Tuple of (origin field position, smiley position), or None if not cached
+    """
+    entry = _read_cache(path).get(key)
+    if entry is None:
+        return None
+
+    try:
+        return Point(*entry["origin_field_pos"]), Point(*entry["smiley_pos"])
+    except (KeyError, TypeError):
+        return None
+
+
+def save_geometry(key: str, origin_field_pos: Point, smiley_pos: Point, path: Path = CACHE_PATH) -> None:
+    """
+    Store detected geometry, keeping the entries of other layouts.
+
+    :param key: Key returned by `layout_key`
+    :param origin_field_pos: Screen position of the center of the top left field
+    :param smiley_pos: Screen position of the center of the smiley
+    :param path: Cache file
+    """
+    cache = _read_cache(path)
+    cache[key] = {
+        "origin_field_pos": [int(origin_field_pos.x), int(origin_field_pos.y)],
+        "smiley_pos": [int(smiley_pos.x), int(smiley_pos.y)],
+    }
+    try:
+        path.write_text(json.dumps(cache, indent=2))
+    except OSError:
+        # The cache is only an optimization, a read-only checkout just searches every time
+        pass
@@ -0,0 +1,292 @@
+import json
+from abc import ABC, abstractmethod
+from functools import cache
+from pathlib import Path
+from typing import Literal, Optional
+
+import mss
+import mss.exception
+import mss.screenshot
+import numpy as np
+from cv2 import IMREAD_COLOR, imread
+
+from boardDecoder import BoardDecoder
+from models import FieldValue, Point
+
+IMAGE_DIR = Path(__file__).parent / "images"
+
+# Background color of revealed fields on minesweeperonline
+REVEALED_BGR = (189, 189, 189)
+
+
+class CaptureBackend(ABC):
+    """
+    Source of screen pixels for `MineSweeperSolver`.
+
+    A backend grabs a screen region (mss style dict with left, top, width and height) and
+    returns it as a (height, width, 4) uint8 BGRA array, without copying where possible.
+    """
+
+    @property
+    @abstractmethod
+    def monitors(self) -> list[dict[str, int]]:
+        """Monitor regions like `mss.mss().monitors`, index 0 is the whole virtual screen."""
+
+    @abstractmethod
+    def grab(self, region: dict[str, int]) -> np.ndarray:
+        """
+        Capture a screen region.
+
+        :param region: Dict with left, top, width and height in screen coordinates
+        :return: Array of shape (height, width, 4) in BGRA order
+        :raises mss.exception.ScreenShotError: If the region cannot be captured
+        """
+
+
+class MssBackend(CaptureBackend):
+    """Capture the real screen with mss (default backend)."""
+
+    def __init__(self) -> None:
+        self.sct = mss.mss()
+
+    @property
+    def monitors(self) -> list[dict[str, int]]:
+        return self.sct.monitors
+
+    def grab(self, region: dict[str, int]) -> np.ndarray:
+        return BoardDecoder.as_array(self.sct.grab(region))
+
+    def grab_screenshot(self, region: dict[str, int]) -> mss.screenshot.ScreenShot:
+        """Capture a screen region as the raw mss `ScreenShot`, for the `ScreenShot.pixel()` decoder."""
+        return self.sct.grab(region)
+
+
+class InMemoryBackend(CaptureBackend):
+    """
+    Capture from a frame held in memory, e.g. one made by `render_screen`.
+
+    Grabs are views into the current frame, so they cost no copy at all. Feed new frames
+    with `show` to simulate the screen changing.
+    """
+
+    def __init__(self, frame: np.ndarray, left: int = 0, top: int = 0) -> None:
+        """
+        :param frame: Virtual screen of shape (height, width, 4) in BGRA order
+        :param left: Screen x coordinate of the frame's first column
+        :param top: Screen y coordinate of the frame's first row
+        """
+        self.left = left
+        self.top = top
+        self.frame = frame
+
+    def show(self, frame: np.ndarray) -> None:
+        """Replace the virtual screen with a new frame of the same size."""
+        if frame.shape != self.frame.shape:
+            raise ValueError(f"Frame shape {frame.shape} does not match screen shape {self.frame.shape}")
+        self.frame = frame
+
+    @property
+    def monitors(self) -> list[dict[str, int]]:
+        height, width = self.frame.shape[:2]
+        screen = {"left": self.left, "top": self.top, "width": width, "height": height}
+        return [screen, dict(screen)]
+
+    def grab(self, region: dict[str, int]) -> np.ndarray:
+        top = region["top"] - self.top
+        left = region["left"] - self.left
+        if (
+                top < 0 or left < 0
+                or top + region["height"] > self.frame.shape[0]
+                or left + region["width"] > self.frame.shape[1]
+        ):
+            raise mss.exception.ScreenShotError(f"Region {region} is outside of the in-memory screen")
+
+        return self.frame[top:top + region["height"], left:left + region["width"]]
+
+
+class RecordingBackend(CaptureBackend):
+    """
+    Wrap another backend and store every grab on disk for `ReplayBackend`.
+
+    Each grab is saved as `frame_<n>.npy` and listed with its region in `grabs.jsonl`,
+    the monitor layout is saved to `monitors.json`.
+    """
+
+    def __init__(self, backend: CaptureBackend, directory: Path | str) -> None:
+        """
+        :param backend: Backend doing the actual capture
+        :param directory: Directory for the recording, created if missing
+        """
+        self.backend = backend
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.frames_recorded = 0
+        (self.directory / "monitors.json").write_text(json.dumps(self.backend.monitors))
+
+    @property
+    def monitors(self) -> list[dict[str, int]]:
+        return self.backend.monitors
+
+    def grab(self, region: dict[str, int]) -> np.ndarray:
+        image = self.backend.grab(region)
+
+        file_name = f"frame_{self.frames_recorded:06d}.npy"
+        np.save(self.directory / file_name, image)
+        with open(self.directory / "grabs.jsonl", "a") as index:
+            index.write(json.dumps({"file": file_name, "region": {key: int(value) for key, value in region.items()}}) + "\n")
+        self.frames_recorded += 1
+
+        return image
+
+
+class ReplayBackend(CaptureBackend):
+    """
+    Replay a recording made by `RecordingBackend`.
+
+    Grabs are answered with the recorded frames in their original order. Frames are
+    memory-mapped, so replaying a long recording does not load it into memory.
+    """
+
+    def __init__(self, directory: Path | str, loop: bool = False) -> None:
+        """
+        :param directory: Directory written by `RecordingBackend`
+        :param loop: Start over at the first frame after the last one, useful for benchmarks
+        """
+        self.directory = Path(directory)
+        self.loop = loop
+        self._monitors = json.loads((self.directory / "monitors.json").read_text())
+        with open(self.directory / "grabs.jsonl") as index:
+            self.grabs = [json.loads(line) for line in index if line.strip()]
+        self.position = 0
+
+    @property
+    def monitors(self) -> list[dict[str, int]]:
+        return self._monitors
+
+    def grab(self, region: dict[str, int]) -> np.ndarray:
+        if self.position >= len(self.grabs):
+            if not self.loop or not self.grabs:
+                raise mss.exception.ScreenShotError("Replay has no frames left")
+            self.position = 0
+
+        recorded = self.grabs[self.position]
+        self.position += 1
+
+        if {key: int(value) for key, value in region.items()} != recorded["region"]:
+            raise mss.exception.ScreenShotError(
+                f"Grab of {region} does not match recorded region {recorded['region']}"
+            )
+
+        return np.load(self.directory / recorded["file"], mmap_mode="r")
+
+
+@cache
+def load_template(
+        image_name: Literal['cool_smiley', 'dead_smiley', 'first_field', 'happy_smiley']
+) -> np.ndarray:
+    """Load a template image as BGR array (cached per image)."""
+    return imread(str(IMAGE_DIR / f"{image_name}.png"), IMREAD_COLOR)
+
+
+def render_screen(
+        size: tuple[int, int],
+        origin_field_pos: Point,
+        smiley_pos: Point,
+        codes: np.ndarray,
+        color_map: dict[tuple[int, int, int], FieldValue],
+        status: Literal['win', 'loss', 'ongoing'] = 'ongoing',
+        field_diameter: int = 32,
+        frame: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Render a synthetic minesweeperonline screen for `InMemoryBackend`.
+
+    Undiscovered and flagged fields are tiled from the center of the `first_field` template
+    (the whole template is pasted under the tiles at the top left field), revealed
+    fields get the revealed background with their number color in the center, and the
+    smiley template matching `status` is drawn at `smiley_pos`.
+
+    :param size: Screen size (width, height)
+    :param origin_field_pos: Screen position of the center of the top left field
+    :param smiley_pos: Screen position of the center of the smiley
+    :param codes: FieldValue codes of shape (rows, columns)
+    :param color_map: RGB to field value mapping used by the solver
+    :param status: Game state shown by the smiley
+    :param field_diameter: Size of one field in pixels
+    :param frame: Existing frame to draw into instead of allocating a new one
+    :return: Frame of shape (height, width, 4) in BGRA order
+    """
+    width, height = size
+    if frame is None:
+        frame = np.full((height, width, 4), 255, dtype=np.uint8)
+        frame[..., :3] = REVEALED_BGR
+
+    radius = field_diameter // 2
+    first_field = load_template('first_field')
+    template_radius = first_field.shape[0] // 2
+    covered_tile = first_field[
+        template_radius - radius:template_radius + radius,
+        template_radius - radius:template_radius + radius
+    ]
+    value_to_bgr = {value.value: rgb[::-1] for rgb, value in color_map.items()}
+
+    # Paste the whole template at the top left field so template search finds it. It is larger
+    # than a field, so the tiles drawn afterwards replace the part overlapping the neighbours
+    if codes[0, 0] == FieldValue.UNDISCOVERED.value:
+        frame[
+            origin_field_pos.y - template_radius:origin_field_pos.y - template_radius + first_field.shape[0],
+            origin_field_pos.x - template_radius:origin_field_pos.x - template_radius + first_field.shape[1],
+            :3
+        ] = first_field
+
+    rows, columns = codes.shape
+    for row in range(rows):
+        for col in range(columns):
+            x = origin_field_pos.x + col * field_diameter
+            y = origin_field_pos.y + row * field_diameter
+            tile = frame[y - radius:y + radius, x - radius:x + radius, :3]
+            code = int(codes[row, col])
+
+            if code in (FieldValue.UNDISCOVERED.value, FieldValue.FLAGGED.value):
+                tile[:] = covered_tile
+                continue
+
+            tile[:] = REVEALED_BGR
+            if code in value_to_bgr and code != FieldValue.EMPTY.value:
+                tile[radius - 3:radius + 3, radius - 3:radius + 3] = value_to_bgr[code]
+
+    smiley_name = {'win': 'cool_smiley', 'loss': 'dead_smiley', 'ongoing': 'happy_smiley'}[status]
+    smiley = load_template(smiley_name)
+    smiley_top = smiley_pos.y - smiley.shape[0] // 2
+    smiley_left = smiley_pos.x - smiley.shape[1] // 2
+    frame[smiley_top:smiley_top + smiley.shape[0], smiley_left:smiley_left + smiley.shape[1], :3] = smiley
+
+    return frame
+
+
+if __name__ == '__main__':
+    from boardDecoder import ColorLookupTable
+    from mineSweeperSolver import MineSweeperSolver
+
+    # Round trip: render a board and decode it again. The covered top left field gets the
+    # oversized template, which must not hide its revealed neighbours from the decoder
+    columns, rows = 8, 8
+    diameter = MineSweeperSolver.FIELD_DIAMETER
+    radius = diameter // 2
+    origin = Point(100, 100)
+
+    codes = np.full((rows, columns), FieldValue.UNDISCOVERED.value, dtype=np.int8)
+    codes[0, 1] = FieldValue.ONE.value
+    codes[1, 0] = FieldValue.EMPTY.value
+    codes[1, 1] = FieldValue.TWO.value
+
+    frame = render_screen((500, 400), origin, Point(228, 40), codes, MineSweeperSolver.COLOR_MAP, field_diameter=diameter)
+    board = frame[origin.y - radius:origin.y - radius + rows * diameter, origin.x - radius:origin.x - radius + columns * diameter]
+    decoder = BoardDecoder(
+        centers=[Point(col * diameter + radius, row * diameter + radius) for row in range(rows) for col in range(columns)],
+        border_offset=MineSweeperSolver.FIELD_BORDER_OFFSET,
+        color_lut=ColorLookupTable(MineSweeperSolver.COLOR_MAP),
+    )
+    decoded = decoder.decode(board).reshape(rows, columns)
+    assert np.array_equal(decoded, codes), f"Decoded board differs from the rendered one:\n{decoded}"
+    print("render_screen round trip ok")
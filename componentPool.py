@@ -0,0 +1,133 @@
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+import numpy as np
+
+from neighborTable import NeighborTable, neighbor_table
+from probability import FLAGGED_CODE, UNDISCOVERED_CODE, Component, ComponentSolution, enumerate_component
+
+# Board state of the worker process, attached once by `_attach_board`
+_shared: Optional[SharedMemory] = None
+_values: Optional[np.ndarray] = None
+_neighbors: Optional[NeighborTable] = None
+
+
+def _attach_board(name: str, columns: int, rows: int) -> None:
+    """Map the shared board of the pool into a freshly started worker."""
+    global _shared, _values, _neighbors
+    # The parent owns the block and unlinks it, workers must not track it as well
+    _shared = SharedMemory(name=name, track=False)
+    _values = np.ndarray(columns * rows, dtype=np.int8, buffer=_shared.buf)
+    _neighbors = neighbor_table(columns, rows)
+
+
+def _warm_up(_: int) -> int:
+    return os.getpid()
+
+
+def _component_from_board(cells: tuple[int, ...]) -> Component:
+    """Rebuild the constraints of a component from the shared board, in the order of `cells`."""
+    index = {cell: local for local, cell in enumerate(cells)}
+    numbers = {
+        neighbor
+        for cell in cells for neighbor in _neighbors.of[cell]
+        if _values.item(neighbor) > 0
+    }
+
+    constraints = []
+    for number in sorted(numbers):
+        local_cells = []
+        flags = 0
+        for neighbor in _neighbors.of[number]:
+            code = _values.item(neighbor)
+            if code == UNDISCOVERED_CODE:
+                local_cells.append(index[neighbor])
+            elif code == FLAGGED_CODE:
+                flags += 1
+        constraints.append((tuple(local_cells), _values.item(number) - flags))
+    return Component(cells=cells, constraints=constraints)
+
+
+def _solve_shared(cells: tuple[int, ...], deadline: Optional[float]) -> ComponentSolution:
+    """Enumerate one component of the shared board in a worker."""
+    return enumerate_component(_component_from_board(cells), deadline)
+
+
+class ComponentPool:
+    """
+    Persistent process pool that enumerates large frontier components in parallel.
+
+    Independent components do not share any cell, so their enumerations can run on
+    separate cores. The workers are started once and kept warm for every move; the board is
+    kept in shared memory, so a task only carries the cell ids of its component and every
+    worker rebuilds the constraints from the board it already has mapped.
+
+    The pool only fits boards of the size it was created for. Close it (or use it as a
+    context manager) to stop the workers and free the shared memory.
+
+    Attributes:
+        columns, rows: Board size the pool was created for
+        workers: Number of worker processes
+    """
+
+    def __init__(self, columns: int, rows: int, workers: Optional[int] = None) -> None:
+        """
+        :param columns: Number of columns of the board
+        :param rows: Number of rows of the board
+        :param workers: Number of worker processes, defaults to the number of CPUs
+        """
+        self.columns = columns
+        self.rows = rows
+        self.workers = max(1, workers or os.cpu_count() or 1)
+
+        self._shared = SharedMemory(create=True, size=columns * rows)
+        self._values = np.ndarray(columns * rows, dtype=np.int8, buffer=self._shared.buf)
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            initializer=_attach_board,
+            initargs=(self._shared.name, columns, rows),
+        )
+        # Start every worker now, so the first move does not pay for the process start
+        list(self._executor.map(_warm_up, range(self.workers)))
+
+    def __enter__(self) -> "ComponentPool":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def fits(self, columns: int, rows: int) -> bool:
+        return (columns, rows) == (self.columns, self.rows)
+
+    def publish(self, values: np.ndarray) -> None:
+        """
+        Copy the current board into shared memory.
+
+        Must not be called while submitted components are still being solved.
+        """
+        self._values[:] = values
+
+    def submit(self, component: Component, deadline: Optional[float] = None) -> Future[ComponentSolution]:
+        """
+        Enumerate a component of the published board in a worker.
+
+        `time.perf_counter()` reads CLOCK_MONOTONIC on Linux, which every process shares, so
+        the deadline also covers the time the task waits in the queue.
+
+        :param component: Frontier component of the board last passed to `publish`
+        :param deadline: `time.perf_counter()` value the enumeration is abandoned at, None for no limit
+        :return: Future of the solution, raising TimeoutError if the deadline passed
+        """
+        return self._executor.submit(_solve_shared, component.cells, deadline)
+
+    def close(self) -> None:
+        """Stop the workers and free the shared memory."""
+        if self._executor is None:
+            return
+        self._executor.shutdown()
+        self._executor = None
+        del self._values
+        self._shared.close()
+        self._shared.unlink()
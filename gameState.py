@@ -0,0 +1,307 @@
+from itertools import groupby
+from typing import Literal, Optional, Sequence
+
+import numpy as np
+
+from models import Field, FieldValue, GameResult
+from neighborTable import NeighborTable, neighbor_table
+from patternCache import PatternCache
+
+UNDISCOVERED_CODE = FieldValue.UNDISCOVERED.value
+
+
+class GameState:
+    """
+    Board bookkeeping and statistics shared by everything strategies can play against.
+
+    Strategies only use the surface defined here (`board`, `rows`, `columns`, `total_mines`,
+    `undiscovered`, `flagged`, `neighbors`, `moves_made`, `game_history`, ...) plus `click_field` and
+    `toggle_flag`, which every game implementation provides itself.
+
+    The board state is stored in flat arrays indexed by field id: `values` holds the FieldValue
+    code of every field and `screen_positions`/`board_positions` their coordinates. `board`
+    only contains `Field` views into these arrays, so vectorized strategies can read `values`
+    directly while existing strategies keep using `board[row][col].value`.
+
+    Attributes:
+        DIFFICULTY_TO_SIZE: Mapping of difficulty levels to (columns, rows, mines) tuples
+        ZOBRIST_SEED: Seed of the random keys used for the incremental board fingerprint
+    """
+
+    # Board dimensions for each difficulty level (COLUMNS, ROWS, MINES)
+    DIFFICULTY_TO_SIZE = {
+        "beginner": (9, 9, 10),
+        "intermediate": (16, 16, 40),
+        "expert": (30, 16, 99)
+    }
+
+    # Seed of the random keys used for the incremental board fingerprint
+    ZOBRIST_SEED = 0
+
+    # Index of the current board within a reproducible board set, None where the board
+    # is not reproducible (on screen)
+    board_index: Optional[int] = None
+
+    def __init__(self, columns: int, rows: int, total_mines: int) -> None:
+        """
+        :param columns: Number of columns of the board
+        :param rows: Number of rows of the board
+        :param total_mines: Number of mines on the board
+        """
+        self.columns, self.rows, self.total_mines = columns, rows, total_mines
+
+        # Neighbor ids per field id, shared by every game with the same dimensions
+        self.neighbors: NeighborTable = neighbor_table(columns, rows)
+
+        # Statistics tracking
+        self.moves_made = 0
+        self.total_moves = 0
+        self.best_win_moves = self.rows * self.columns + 1
+        self.game_history: list[GameResult] = []
+
+        # Solved frontier patterns, reused across all games played on this instance
+        self.pattern_cache = PatternCache()
+
+    def _init_board(
+            self,
+            screen_positions: np.ndarray | Sequence[tuple[int, int]],
+            board_positions: np.ndarray | Sequence[tuple[int, int]],
+    ) -> None:
+        """
+        Create an undiscovered board and build the indices on top of it.
+
+        :param screen_positions: (x, y) screen position of every field, ordered by field id
+        :param board_positions: (x, y) position within the board image of every field, ordered by field id
+        """
+        cells = self.rows * self.columns
+
+        # Authoritative board state, indexed by field id (col + row * columns)
+        self.values: np.ndarray = np.full(cells, FieldValue.UNDISCOVERED.value, dtype=np.int8)
+        self.screen_positions: np.ndarray = np.asarray(screen_positions, dtype=np.int32).reshape(cells, 2)
+        self.board_positions: np.ndarray = np.asarray(board_positions, dtype=np.int32).reshape(cells, 2)
+
+        self._fields: list[Field] = [Field(self, field_id) for field_id in range(cells)]
+        self.board: list[list[Field]] = [
+            self._fields[row * self.columns:(row + 1) * self.columns] for row in range(self.rows)
+        ]
+
+        # Incrementally maintained indices of undiscovered and flagged fields (field id -> Field),
+        # kept in sync by `_set_value` so strategies never have to scan the whole board
+        self.undiscovered: dict[int, Field] = {field.id: field for field in self._fields}
+        self.flagged: dict[int, Field] = {}
+
+        # Zobrist fingerprint of the board: XOR of one random key per (field, value),
+        # updated in `_set_value` so detecting a board change costs O(changed fields)
+        # Keys are kept in one uint64 array, a list of Python ints would take ~10x the memory
+        self._zobrist_keys: np.ndarray = np.random.default_rng(self.ZOBRIST_SEED).integers(
+            0, 2 ** 64, size=(cells, len(FieldValue)), dtype=np.uint64
+        )
+        self._initial_fingerprint = int(
+            np.bitwise_xor.reduce(self._zobrist_keys[:, self._zobrist_index(FieldValue.UNDISCOVERED.value)])
+        )
+        self.board_fingerprint = self._initial_fingerprint
+
+        # Ids of changed fields in order of change, so strategies can follow the board
+        # incrementally with a cursor; `board_epoch` counts resets, which clear the log
+        self.change_log: list[int] = []
+        self.board_epoch = 0
+
+    def id_from_rc(self, row: int, col: int) -> int:
+        return col + row * self.columns
+
+    def neighbor_fields(self, field: Field) -> list[Field]:
+        """Return the up to 8 fields around `field`."""
+        fields = self._fields
+        return [fields[neighbor] for neighbor in self.neighbors.of[field.id]]
+
+    def _reset_fields(self) -> None:
+        """Mark every field undiscovered again and reset the indices and the fingerprint."""
+        self.values.fill(FieldValue.UNDISCOVERED.value)
+        self.undiscovered = {field.id: field for field in self._fields}
+        self.flagged = {}
+        self.board_fingerprint = self._initial_fingerprint
+        self.change_log = []
+        self.board_epoch += 1
+
+    @staticmethod
+    def _zobrist_index(code: int) -> int:
+        """Column of a FieldValue code in the Zobrist key table."""
+        return code - FieldValue.UNDISCOVERED.value
+
+    def _set_value(self, field: Field, value: FieldValue) -> None:
+        """Set a field's value and keep the undiscovered/flagged indices and the fingerprint in sync."""
+        old_code = self.values.item(field.id)
+        if old_code == value.value:
+            return
+
+        self.values[field.id] = value.value
+        self._track_change(field.id, old_code, value.value)
+
+    def _set_values(self, ids: np.ndarray | Sequence[int], codes: np.ndarray) -> list[Field]:
+        """
+        Vectorized `_set_value`: write the codes of many fields at once.
+
+        :param ids: Distinct field ids, aligned with `codes`
+        :param codes: FieldValue codes
+        :return: The fields whose value changed
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        codes = np.asarray(codes, dtype=np.int8)
+        old_codes = self.values[ids]
+
+        changed = old_codes != codes
+        ids, old_codes, codes = ids[changed], old_codes[changed], codes[changed]
+        self.values[ids] = codes
+
+        for field_id, old_code, code in zip(ids.tolist(), old_codes.tolist(), codes.tolist()):
+            self._track_change(field_id, old_code, code)
+        return [self._fields[field_id] for field_id in ids.tolist()]
+
+    def _track_change(self, field_id: int, old_code: int, code: int) -> None:
+        """Update the indices, the fingerprint and the change log after a field's code changed."""
+        self.change_log.append(field_id)
+
+        keys = self._zobrist_keys
+        self.board_fingerprint ^= (
+            keys.item(field_id, old_code - UNDISCOVERED_CODE) ^ keys.item(field_id, code - UNDISCOVERED_CODE)
+        )
+
+        if old_code == FieldValue.UNDISCOVERED.value:
+            del self.undiscovered[field_id]
+        elif old_code == FieldValue.FLAGGED.value:
+            del self.flagged[field_id]
+
+        if code == FieldValue.UNDISCOVERED.value:
+            self.undiscovered[field_id] = self._fields[field_id]
+        elif code == FieldValue.FLAGGED.value:
+            self.flagged[field_id] = self._fields[field_id]
+
+    def _log_game(self, game_id: int, game_result: Literal['win', 'loss'], game_duration: float):
+        """Record game result in history."""
+        self.game_history.append(
+            GameResult(
+                id=game_id,
+                result=game_result,
+                total_moves=self.moves_made,
+                time_played=game_duration
+            )
+        )
+
+    def create_stats(self, games_completed: int) -> dict[str, any]:
+        """
+        Compute and return summary statistics for all completed games.
+
+        Parameters
+        ----------
+        games_completed : int
+            Total number of games played in this run. Should match the size of `self.game_history`.
+
+        Returns
+        -------
+        dict[str, any]
+            Nested dictionary of aggregated statistics with the following structure:
+
+            "games_played" : int
+                Total number of games executed in this run.
+
+            "wins" : int
+                Number of games where the final result was a win.
+
+            "losses" : int
+                Number of games lost (games_played - wins).
+
+            "win_rate" : float
+                Fraction of games won over all games played.
+
+            "longest_win_streak" : int
+                Maximum consecutive wins in order of play.
+
+            "longest_loss_streak" : int
+                Maximum consecutive losses in order of play.
+
+            "moves" : dict
+                Movement-related metrics:
+                    "total_moves" : int
+                        Sum of all moves taken across all games.
+                    "avg_moves_win" : float
+                        Average number of moves required to win.
+                    "avg_moves_loss" : float
+                        Average number of moves required to lose.
+
+            "best_results" : dict
+                Individual notable outcomes:
+                    "least_moves_played_win" : int
+                        Fewest moves required in any winning game.
+                    "fastest_win_time" : float
+                        Shortest duration of a winning game (in seconds).
+
+            "timing" : dict
+                Execution time metrics:
+                    "total_time" : float
+                        Total time spent playing all games (seconds).
+                    "avg_timer_per_game_won" : float
+                        Average duration of games where the bot won (seconds).
+
+            "pattern_cache" : dict
+                Frontier pattern cache usage of probability based strategies:
+                size, maxsize, hits, misses and hit_rate (see `PatternCache.stats`).
+        """
+        wins = sum(1 for game in self.game_history if game.result == "win")
+        total_moves = sum(game.total_moves for game in self.game_history)
+        total_win_moves = sum(game.total_moves for game in self.game_history if game.result == "win")
+
+        losses = games_completed - wins
+        total_loss_moves = total_moves - total_win_moves
+
+        # Build streaks
+        streaks = [
+            (result, len(list(group)))
+            for result, group in groupby(game.result for game in self.game_history)
+        ]
+
+        max_win_streak = max((run for res, run in streaks if res == "win"), default=0)
+        max_loss_streak = max((run for res, run in streaks if res == "loss"), default=0)
+
+        # Time Calculations
+        total_time = sum(game.time_played for game in self.game_history)
+        avg_timer_per_game_won = round(
+            sum(
+                game.time_played for game in self.game_history if game.result == 'win'
+            ) / wins,
+            ndigits=3
+        ) if wins > 0 else None
+
+        fastest_win_time = min(
+            (game.time_played for game in self.game_history if game.result == 'win'),
+            default=None
+        )
+        fastest_win_time = round(fastest_win_time, 3) if fastest_win_time is not None else None
+
+        stats = {
+            "games_played": games_completed,
+            "wins": wins,
+            "losses": losses,
+            "win_rate": wins / games_completed,
+            "longest_win_streak": max_win_streak,
+            "longest_loss_streak": max_loss_streak,
+
+            "moves": {
+                "total_moves": total_moves,
+                "avg_moves_win": round(total_win_moves / wins if wins else 0, 3),
+                "avg_moves_loss": round(total_loss_moves / losses if losses else 0, 3),
+            },
+
+            "best_results": {
+                "least_moves_played_win": self.best_win_moves,
+                "fastest_win_time": fastest_win_time,
+            },
+
+            "timing": {
+                "total_time": round(total_time, 3),
+                "avg_timer_per_game_won": avg_timer_per_game_won,
+            },
+
+            "pattern_cache": self.pattern_cache.stats(),
+        }
+
+        return stats
@@ -0,0 +1,137 @@
+import numpy as np
+
+from gameState import GameState
+from probability import Component, frontier_constraints, split_components
+
+# Above this magnitude the int64 elimination switches to exact Python ints
+OVERFLOW_GUARD = 2 ** 31
+
+
+def _reduce(matrix: np.ndarray) -> np.ndarray:
+    """
+    Bring an augmented integer matrix [A | b] to reduced row echelon form without fractions.
+
+    Every elimination step combines rows as `pivot * row - factor * pivot_row`, which keeps
+    the entries integral; dividing each row by the gcd of its entries keeps them small. Rows
+    are updated all at once with NumPy. Should the entries grow past `OVERFLOW_GUARD`
+    anyway, the rest of the elimination runs on Python ints.
+
+    :return: The reduced matrix, rows without pivot removed
+    """
+    rows, columns = matrix.shape
+    pivot_row = 0
+    for column in range(columns - 1):
+        if pivot_row == rows:
+            break
+
+        candidates = np.flatnonzero(matrix[pivot_row:, column]) + pivot_row
+        if not candidates.size:
+            continue
+
+        pivot = candidates[0]
+        matrix[[pivot_row, pivot]] = matrix[[pivot, pivot_row]]
+        if matrix[pivot_row, column] < 0:
+            matrix[pivot_row] = -matrix[pivot_row]
+
+        factors = matrix[:, column].copy()
+        factors[pivot_row] = 0
+        others = np.flatnonzero(factors)
+        if others.size:
+            matrix[others] = (
+                matrix[pivot_row, column] * matrix[others] - factors[others, None] * matrix[pivot_row]
+            )
+            divisors = np.gcd.reduce(matrix[others], axis=1)
+            divisors[divisors == 0] = 1
+            matrix[others] //= divisors[:, None]
+
+            if matrix.dtype != object and np.abs(matrix).max() > OVERFLOW_GUARD:
+                matrix = matrix.astype(object)
+
+        pivot_row += 1
+
+    return matrix[:pivot_row]
+
+
+def _forced_cells(matrix: np.ndarray) -> tuple[set[int], set[int]]:
+    """
+    Find unknowns forced by a single row of a reduced system over 0/1 unknowns.
+
+    A row `a · x = b` can reach at least the sum of its negative and at most the sum of
+    its positive coefficients. If `b` equals one of these bounds, only one assignment of the
+    row's unknowns reaches it.
+
+    :return: Column indices forced to 0 and forced to 1
+    """
+    coefficients, rhs = matrix[:, :-1], matrix[:, -1]
+    lowest = np.where(coefficients < 0, coefficients, 0).sum(axis=1)
+    highest = np.where(coefficients > 0, coefficients, 0).sum(axis=1)
+
+    zeros: set[int] = set()
+    ones: set[int] = set()
+    for row in np.flatnonzero((rhs == lowest) | (rhs == highest)).tolist():
+        positive = np.flatnonzero(coefficients[row] > 0).tolist()
+        negative = np.flatnonzero(coefficients[row] < 0).tolist()
+        if rhs[row] == highest[row]:
+            ones.update(positive)
+            zeros.update(negative)
+        else:
+            zeros.update(positive)
+            ones.update(negative)
+    return zeros, ones
+
+
+def solve_component(component: Component) -> tuple[set[int], set[int]]:
+    """
+    Deduce safe cells and mines of one frontier component with Gaussian elimination.
+
+    Known cells are substituted back into the original equations and the system is reduced
+    again until no more cells are forced.
+
+    :return: Field ids of safe cells and of mines
+    """
+    matrix = np.zeros((len(component.constraints), len(component.cells) + 1), dtype=np.int64)
+    for row, (cells, mines) in enumerate(component.constraints):
+        matrix[row, list(cells)] = 1
+        matrix[row, -1] = mines
+
+    known = np.zeros(len(component.cells), dtype=bool)
+    safe: set[int] = set()
+    mines: set[int] = set()
+    while True:
+        zeros, ones = _forced_cells(_reduce(matrix.copy()))
+        zeros -= safe
+        ones -= mines
+        if not zeros and not ones:
+            break
+
+        safe |= zeros
+        mines |= ones
+        for column in ones:
+            matrix[:, -1] -= matrix[:, column]
+        for column in zeros | ones:
+            matrix[:, column] = 0
+            known[column] = True
+        if known.all():
+            break
+
+    return {component.cells[cell] for cell in safe}, {component.cells[cell] for cell in mines}
+
+
+def solve_frontier(game: GameState) -> tuple[set[int], set[int]]:
+    """
+    Deduce safe fields and mines of a game's current board from the frontier linear system.
+
+    Every revealed number next to undiscovered fields is an equation over 0/1 unknowns. The
+    frontier is split into independent components (see `probability.split_components`),
+    each reduced on its own, which finds deductions involving several numbers that the
+    single-number rules miss, without enumerating any assignment.
+
+    :return: Field ids of safe fields and of mines
+    """
+    safe: set[int] = set()
+    mines: set[int] = set()
+    for component in split_components(frontier_constraints(game)):
+        component_safe, component_mines = solve_component(component)
+        safe |= component_safe
+        mines |= component_mines
+    return safe, mines
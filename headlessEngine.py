@@ -0,0 +1,191 @@
+import random
+import time
+from typing import Callable, Literal, Optional
+
+from boardCorpus import BoardCorpus, finalize_first_click
+from boardGenerator import generate_board, neighbor_counts
+from gameState import GameState
+from models import Field, FieldValue
+
+
+class HeadlessMineSweeper(GameState):
+    """
+    In-process Minesweeper game with the same surface strategies use on `MineSweeperSolver`.
+
+    There is no screen and no mouse: `click_field` and `toggle_flag` change the board
+    directly, so an unmodified `next_move` strategy from `main.py` can play thousands of
+    games per second. Mines are placed on the first click, which is never a mine
+    (like on minesweeperonline).
+
+    Field positions carry board coordinates (column, row) instead of pixels.
+    """
+
+    def __init__(
+            self,
+            difficulty: Literal["beginner", "intermediate", "expert"] = "beginner",
+            custom: Optional[tuple[int, int, int]] = None,
+            play_games: int = 1,
+            stop_after_win: bool = False,
+            seed: Optional[int] = None,
+            game_offset: int = 0,
+            corpus: Optional[BoardCorpus] = None,
+    ) -> None:
+        """
+        Args:
+            difficulty: Game difficulty level
+            custom: Custom dimensions (columns, rows, mines) to override difficulty
+            play_games: Number of games to play
+            stop_after_win: Whether to stop after first win
+            seed: Seed of the board set, random if None. Game `i` plays board `game_offset + i`
+                of `boardGenerator.generate_boards`, so a game's board does not depend on which
+                games were played before
+            game_offset: Index of the first game, used to split one seeded run into shards
+            corpus: Play the boards of a stored corpus instead of generating them, game `i`
+                plays corpus board `game_offset + i`. Overrides difficulty, custom and seed
+        """
+        if corpus is not None:
+            size = corpus.size
+        else:
+            size = custom if custom else self.DIFFICULTY_TO_SIZE[difficulty]
+        super().__init__(*size)
+
+        if not 0 < self.total_mines < self.rows * self.columns:
+            raise ValueError(f"Cannot place {self.total_mines} mines on a {self.columns}x{self.rows} board")
+
+        # Game settings
+        self.play_games = play_games
+        self.stop_after_win = stop_after_win
+        self.corpus = corpus
+        if corpus is not None:
+            seed = corpus.seed
+        self.seed = seed if seed is not None else random.getrandbits(63)
+        self.game_offset = game_offset
+        self.games_started = 0
+
+        positions = [(c, r) for r in range(self.rows) for c in range(self.columns)]
+        self._init_board(positions, positions)
+
+        # Hidden game state, mines are placed on the first click
+        self._mines: Optional[list[bool]] = None
+        self._adjacent_mines: list[int] = []
+        self._safe_fields_left = self.rows * self.columns - self.total_mines
+        self.status: Literal['win', 'loss', 'ongoing'] = 'ongoing'
+
+    @property
+    def board_index(self) -> int:
+        """Index of the current game's board within the seeded board set or the corpus."""
+        return self.game_offset + self.games_started
+
+    def _place_mines(self, first_click_id: int) -> None:
+        """Place the mines of the current game's board anywhere but on the first clicked field."""
+        board_index = self.board_index
+        if self.corpus is not None:
+            mines = finalize_first_click(self.corpus[board_index], first_click_id)
+        else:
+            mines = generate_board(self.seed, board_index, self.columns, self.rows, self.total_mines, first_click_id)
+        self._mines = mines.ravel().tolist()
+        self._adjacent_mines = neighbor_counts(mines).ravel().tolist()
+
+    def _reveal(self, field: Field) -> None:
+        """Reveal a safe field and flood-fill empty areas, leaving flagged fields closed."""
+        undiscovered_code = FieldValue.UNDISCOVERED.value
+        values = self.values
+        stack = [field.id]
+        while stack:
+            current = stack.pop()
+            if values.item(current) != undiscovered_code:
+                continue
+
+            count = self._adjacent_mines[current]
+            values[current] = count
+            self._track_change(current, undiscovered_code, count)
+            self._safe_fields_left -= 1
+
+            if count == 0:
+                stack.extend(
+                    neighbor for neighbor in self.neighbors.of[current]
+                    if values.item(neighbor) == undiscovered_code
+                )
+
+    def click_field(self, field: Field) -> None:
+        """Execute left-click on the specified field."""
+        self.moves_made += 1
+        if self.status != 'ongoing' or field.value != FieldValue.UNDISCOVERED:
+            return
+
+        if self._mines is None:
+            self._place_mines(field.id)
+
+        if self._mines[field.id]:
+            self.status = 'loss'
+            return
+
+        self._reveal(field)
+        if self._safe_fields_left == 0:
+            self.status = 'win'
+
+    def toggle_flag(self, field: Field) -> None:
+        """Toggle flag on the specified field."""
+        self.moves_made += 1
+        if self.status != 'ongoing' or field.value not in (FieldValue.UNDISCOVERED, FieldValue.FLAGGED):
+            return
+
+        self._set_value(
+            field,
+            FieldValue.FLAGGED if field.value != FieldValue.FLAGGED
+            else FieldValue.UNDISCOVERED
+        )
+
+    def check_game_status(self) -> Literal['win', 'loss', 'ongoing']:
+        """Return 'win', 'loss' or 'ongoing'."""
+        return self.status
+
+    def reset_board(self) -> None:
+        """Start a new game on the same board size."""
+        self.games_started += 1
+        self._reset_fields()
+        self._mines = None
+        self._adjacent_mines = []
+        self._safe_fields_left = self.rows * self.columns - self.total_mines
+        self.status = 'ongoing'
+
+    def start(self, next_move_strategy: Callable[["HeadlessMineSweeper"], None]) -> dict[str, any]:
+        """
+        Play `play_games` games with the given strategy.
+
+        Mirrors `MineSweeperSolver.start`: the strategy is called until the game is won or
+        lost, every game is logged to `game_history` and the result of `create_stats` is returned.
+
+        :param next_move_strategy: Callback making one or more moves per call
+        :return: Statistics dictionary, see `GameState.create_stats`
+        :raises RuntimeError: If the strategy returns without making a move
+        """
+        games_completed = 0
+
+        while games_completed < self.play_games:
+            game_start_time = time.perf_counter()
+
+            while self.status == 'ongoing':
+                moves_before = self.moves_made
+                next_move_strategy(self)
+                self.total_moves += 1
+
+                if self.moves_made == moves_before:
+                    raise RuntimeError("Strategy returned without making a move")
+
+            games_completed += 1
+            self._log_game(
+                game_id=games_completed,
+                game_result=self.status,
+                game_duration=time.perf_counter() - game_start_time
+            )
+
+            if self.status == 'win':
+                self.best_win_moves = min(self.moves_made, self.best_win_moves)
+                if self.stop_after_win:
+                    break
+
+            self.moves_made = 0
+            self.reset_board()
+
+        return self.create_stats(games_completed)
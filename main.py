@@ -4,7 +4,7 @@ import keyboard
 from rich.pretty import pprint
 
 from mineSweeperSolver import MineSweeperSolver
-from models import FieldValue, Field
+from models import Field
 
 
 def next_move(solver: MineSweeperSolver):
@@ -26,6 +26,10 @@ def next_move(solver: MineSweeperSolver):
     • solver.rows           → Number of rows in the board (int)
     • solver.total_mines    → Total number of mines on the board (int)
     • solver.board          → 2D grid of Field objects (list[list[Field]])
+    • solver.values         → FieldValue codes of all fields by field id (np.ndarray, int8)
+    • solver.undiscovered   → Undiscovered fields by field id, kept up to date (dict[int, Field])
+    • solver.flagged        → Flagged fields by field id, kept up to date (dict[int, Field])
+    • solver.neighbors      → Precomputed neighbor ids: solver.neighbors.of[field.id] (tuple[int, ...])
 
     📋 ABOUT solver.board:
     • Access fields using: solver.board[row][column]
@@ -57,6 +61,7 @@ def next_move(solver: MineSweeperSolver):
     🔍 HELPER METHODS:
     • solver.check_game_status() → Returns 'win', 'loss', or 'ongoing'
     • solver._field_id(row, col) → Convert row/col to unique field ID
+    • solver.neighbor_fields(field) → The up to 8 fields around a field (list[Field])
 
     💡 EXAMPLE STRATEGY (CURRENT):
     The code below shows a RANDOM move strategy - it picks any undiscovered
@@ -74,11 +79,7 @@ def next_move(solver: MineSweeperSolver):
     # OR 5.32 * 10^-13 = 0.000000000000532 % win probability
     # OR 1 chance in 1.88 trillion
     # CAN YOU DO BETTER ?(‾◡◝)
-    undiscovered_fields: list[Field] = [
-        field for row in solver.board
-        for field in row
-        if field.value == FieldValue.UNDISCOVERED
-    ]
+    undiscovered_fields: list[Field] = list(solver.undiscovered.values())
 
     if undiscovered_fields:
         # ⚠️ EXAMPLE: Random selection (replace with your smart logic!)
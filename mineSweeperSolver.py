@@ -1,42 +1,37 @@
-import hashlib
 import time
 import warnings
-from itertools import groupby
-from pathlib import Path
 from typing import Literal, Optional, Callable
 
 import keyboard
 import mouse
 import mss
+import mss.exception
 import mss.tools
+import numpy as np
+from cv2 import COLOR_BGRA2BGR, TM_SQDIFF_NORMED, cvtColor, matchTemplate, minMaxLoc, pyrDown
 from mouse import RIGHT
-from pyautogui import locateCenterOnScreen, ImageNotFoundException
 
-from models import Field, FieldValue, Point, GameResult
+import calibration
+from boardDecoder import BoardDecoder, ColorLookupTable
+from capture import CaptureBackend, MssBackend, load_template
+from gameState import GameState
+from models import Field, FieldValue, Point
 
-IMAGE_DIR = Path(__file__).parent / "images"
 
-
-class MineSweeperSolver:
+class MineSweeperSolver(GameState):
     """
     Automated Minesweeper solver that interacts with the online Minesweeper game.
 
     This class uses screen capture and image recognition to play Minesweeper automatically.
     It captures the game board, analyzes field states, and makes moves by simulating mouse clicks.
 
+    Board bookkeeping (field indices, fingerprint, statistics) is inherited from `GameState`.
+
     Attributes:
-        DIFFICULTY_TO_SIZE: Mapping of difficulty levels to (columns, rows, mines) tuples
         SMILEY_RAD: Radius in pixels of the smiley face button
         COLOR_MAP: Mapping of RGB colors to field values (numbers 1-8, empty, etc.)
     """
 
-    # Board dimensions for each difficulty level (COLUMNS, ROWS, MINES)
-    DIFFICULTY_TO_SIZE = {
-        "beginner": (9, 9, 10),
-        "intermediate": (16, 16, 40),
-        "expert": (30, 16, 99)
-    }
-
     # Smiley button dimensions (cube radius)
     SMILEY_RAD = 17
     FIELD_DIAMETER = 32
@@ -51,6 +46,15 @@ class MineSweeperSolver:
     # Color constants
     BLACK = (0, 0, 0)
 
+    # Template matching (normalized squared difference, lower is better)
+    MATCH_THRESHOLD = 0.02
+    COARSE_MATCH_THRESHOLD = 0.1
+    PYRAMID_REFINE_PADDING = 4
+
+    # Pixels compared when validating cached geometry, in percent of the template size (x, y)
+    CALIBRATION_PROBES = ((50, 50), (0, 0), (100, 100), (50, 0), (0, 50), (25, 75))
+    CALIBRATION_PROBE_TOLERANCE = 8
+
     # RGB to field value mapping
     COLOR_MAP = {
         (255, 255, 255): FieldValue.UNDISCOVERED,  # White upper edge = undiscovered field
@@ -70,6 +74,12 @@ class MineSweeperSolver:
             custom: Optional[tuple[int, int, int]] = None,
             play_games: int = 1,
             stop_after_win: bool = True,
+            decoder: Literal["numpy", "pixel"] = "numpy",
+            capture_mode: Literal["combined", "separate", "dirty"] = "combined",
+            use_calibration_cache: bool = True,
+            capture_backend: Optional[CaptureBackend] = None,
+            origin_field_pos: Optional[Point] = None,
+            smiley_pos: Optional[Point] = None,
     ) -> None:
         """
         Initialize the solver and detect the game board on screen.
@@ -79,18 +89,43 @@ class MineSweeperSolver:
             custom: Custom dimensions (columns, rows, mines) to override difficulty
             play_games: Number of games to play
             stop_after_win: Whether to stop after first win
+            decoder: Board decoding path, 'numpy' classifies the whole board in one vectorized pass,
+                'pixel' samples each field with `ScreenShot.pixel()` (kept for benchmarking; other
+                backends than `MssBackend` are sampled from their array the same way)
+            capture_mode: 'combined' grabs one rectangle covering board and smiley once per tick
+                (requires the numpy decoder), 'separate' grabs both regions on their own,
+                'dirty' only grabs the part of the board that can have changed since the last click
+            use_calibration_cache: Reuse the board geometry detected in a previous run if it
+                still matches the screen, instead of searching the whole screen
+            capture_backend: Source of screen pixels, captures the real screen with mss if None
+            origin_field_pos: Known screen position of the top left field's center, skips detection
+            smiley_pos: Known screen position of the smiley's center, skips detection
 
         Raises:
             RuntimeError: If game elements cannot be detected on screen
+            ValueError: If the combined or dirty capture mode is used with the pixel decoder
         """
+        if capture_mode in ("combined", "dirty") and decoder == "pixel":
+            raise ValueError(f"capture_mode='{capture_mode}' requires decoder='numpy'")
+
         warnings.warn(
             "MineSweeperSolver works best with https://minesweeperonline.com/#beginner-200-left\n"
             "Difficulty can be changed, but not zoom or side position",
             UserWarning
         )
-        # Locate game elements
-        self.origin_field_pos = self._locate_image('first_field')
-        self.smiley_pos = self._locate_image('happy_smiley')
+        self.capture = capture_backend if capture_backend is not None else MssBackend()
+        self.captured_bytes = 0
+
+        # Board configuration
+        size = custom if custom else self.DIFFICULTY_TO_SIZE[difficulty]
+        super().__init__(*size)
+        field_radius = self.FIELD_DIAMETER // 2
+
+        # Locate game elements, trying the geometry cached by a previous run first
+        if origin_field_pos is not None and smiley_pos is not None:
+            self.origin_field_pos, self.smiley_pos = origin_field_pos, smiley_pos
+        else:
+            self.origin_field_pos, self.smiley_pos = self._locate_game_elements(size, use_calibration_cache)
 
         if not self.origin_field_pos or not self.smiley_pos:
             raise RuntimeError(
@@ -101,24 +136,24 @@ class MineSweeperSolver:
                 "3. Game is in starting state\n"
                 "4. Window is not minimized or obscured"
             )
-        # Board configuration
-        size = custom if custom else self.DIFFICULTY_TO_SIZE[difficulty]
-        self.columns, self.rows, self.total_mines = size
-        field_radius = self.FIELD_DIAMETER // 2
 
         # Game settings
         self.play_games = play_games
         self.stop_after_win = stop_after_win
 
-        # Statistics tracking
-        self.moves_made = 0
-        self.total_moves = 0
-        self.best_win_moves = self.rows * self.columns + 1
-        self.game_history: list[GameResult] = []
-
         # Initialize the game board with all fields
         # Each field knows its position on screen and within the board image
-        self.board: list[list[Field]] = self._initialize_game_board(field_radius)
+        self._init_board(*self._initialize_game_board(field_radius))
+
+        # Board decoding
+        # The lookup table is built from the (possibly overridden) COLOR_MAP of this instance
+        self.decoder = decoder
+        self.color_lut = ColorLookupTable(self.COLOR_MAP, default=FieldValue.EMPTY)
+        self.board_decoder = BoardDecoder(
+            centers=self.board_positions,
+            border_offset=self.FIELD_BORDER_OFFSET,
+            color_lut=self.color_lut,
+        )
 
         # Define screen regions for capture
         self.board_region = {
@@ -133,49 +168,42 @@ class MineSweeperSolver:
             "width": 34,
             "height": 34
         }
+        # One rectangle covering both regions, grabbed once per tick in combined capture mode
+        self.capture_mode = capture_mode
+        self.capture_region = self._bounding_region(self.board_region, self.smiley_region)
+
+        # Dirty-rectangle capture: ids of clicked fields whose result has not been seen yet,
+        # None forces a full board grab (start of a game)
+        self._dirty_fields: Optional[set[int]] = None
 
         # Game statistics storage (moves played, wins/losses, etc.)
         self.stats: dict[int, dict[str, int | bool]] = {}
 
-        self.sct = mss.mss()
-
-    def _initialize_game_board(self, field_radius: int):
-        def _compute_field_positions_rel_to_board(screen_pos_x: int, screen_pos_y: int) -> Point:
-            """
-            Convert absolute screen coordinates to relative board image coordinates.
-
-            This is needed because we capture the board region and need to map field positions
-            to pixel coordinates within that captured image.
-            """
-            center_rel_to_board_img: Point = Point(
-                screen_pos_x - self.origin_field_pos.x + field_radius,
-                screen_pos_y - self.origin_field_pos.y + field_radius
-            )
-            return center_rel_to_board_img
-
-        return [
-            [Field(
-                pos_to_screen=Point(*self._get_center_field_pos(r, c)),
-                pos_to_board=_compute_field_positions_rel_to_board(*self._get_center_field_pos(r, c)),
-                id=self.id_from_rc(r, c),
-            ) for c in range(self.columns)]
-            for r in range(self.rows)
-        ]
+    def _initialize_game_board(self, field_radius: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the screen and board image position of every field center.
 
-    def id_from_rc(self, row: int, col: int) -> int:
-        return col + row * self.columns
+        Board image positions are relative to the captured board region, since that is the
+        image the fields are decoded from.
 
-    def _get_center_field_pos(self, row: int, column: int) -> tuple[int, int]:
+        :return: Screen positions and board image positions, both of shape (fields, 2) ordered by field id
         """
-        Calculate the absolute screen pixel position for the center of a field.
+        rows, columns = np.divmod(np.arange(self.rows * self.columns), self.columns)
+        screen_positions = np.stack([
+            self.origin_field_pos.x + columns * self.FIELD_DIAMETER,
+            self.origin_field_pos.y + rows * self.FIELD_DIAMETER,
+        ], axis=1)
+        board_positions = screen_positions - np.array(self.origin_field_pos) + field_radius
+        return screen_positions, board_positions
 
-        :param row: The row index of the field (0-indexed)
-        :param column: The column index of the field (0-indexed)
-        :return: Tuple of (x, y) screen coordinates
-        """
-        x_screen_pos: int = int(self.origin_field_pos.x + (column * self.FIELD_DIAMETER))
-        y_screen_pos: int = int(self.origin_field_pos.y + (row * self.FIELD_DIAMETER))
-        return x_screen_pos, y_screen_pos
+    @staticmethod
+    def _bounding_region(*regions: dict[str, int]) -> dict[str, int]:
+        """Return the smallest mss region containing all given regions."""
+        left = min(region["left"] for region in regions)
+        top = min(region["top"] for region in regions)
+        right = max(region["left"] + region["width"] for region in regions)
+        bottom = max(region["top"] + region["height"] for region in regions)
+        return {"left": left, "top": top, "width": right - left, "height": bottom - top}
 
     def start(
             self,
@@ -239,18 +267,18 @@ class MineSweeperSolver:
         last_game_status = None
         last_board_hash = None
         game_start_time = None
-        board_hash = ""
+        board_hash = 0
         retry_count = 0
         MAX_HASH_RETRIES = 999
 
-        smiley_pos = self._locate_image('happy_smiley')
-        if smiley_pos is None:
-            raise ValueError("Smiley not found on screen")
+        # Reuse the smiley located at construction instead of searching the screen again
+        smiley_pos = self.smiley_pos
 
         # -------- MAIN EXECUTION LOOP --------
         while games_completed < self.play_games:
             skip_turn = False
-            status = self.check_game_status()
+            smiley_image, board_image = self._grab_tick()
+            status = self.check_game_status(smiley_image)
 
             # Detect new game start
             if status == 'ongoing' and last_game_status != 'ongoing':
@@ -270,10 +298,8 @@ class MineSweeperSolver:
                         keyboard.press('esc')
 
                     # Check if website hasn't updated
-                    self._update_board()
-                    board_hash = hashlib.sha256(
-                        bytes(field.value.value + 2 for row in self.board for field in row)
-                    ).hexdigest()
+                    self._update_board(board_image)
+                    board_hash = self.board_fingerprint
 
                     if board_hash != last_board_hash:
                         last_board_hash = board_hash
@@ -334,15 +360,143 @@ class MineSweeperSolver:
         mouse.move(smiley_pos.x, smiley_pos.y)
         mouse.click()
 
-        undiscovered_val = FieldValue.UNDISCOVERED
+        self._reset_fields()
+        self._dirty_fields = None
+
+    def _grab(self, region: dict[str, int]) -> np.ndarray:
+        """Grab a screen region as a (height, width, 4) BGRA array."""
+        self.captured_bytes += region["width"] * region["height"] * 4
+        return self.capture.grab(region)
+
+    @staticmethod
+    def _region_view(image: np.ndarray, image_region: dict[str, int], region: dict[str, int]) -> np.ndarray:
+        """Slice the part of `image` (captured from `image_region`) that covers `region`, without copying."""
+        top = region["top"] - image_region["top"]
+        left = region["left"] - image_region["left"]
+        return image[top:top + region["height"], left:left + region["width"]]
+
+    def _grab_tick(self) -> tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """
+        Capture the images needed for one loop iteration.
+
+        In combined capture mode a single grab of `capture_region` is sliced into the smiley
+        and the board image. In separate mode nothing is grabbed up front and both
+        `check_game_status` and `_update_board` capture their own region.
+
+        :return: Tuple of (smiley image, board image), both None in separate mode
+        """
+        if self.capture_mode != "combined":
+            return None, None
+
+        frame = self._grab(self.capture_region)
+        return (
+            self._region_view(frame, self.capture_region, self.smiley_region),
+            self._region_view(frame, self.capture_region, self.board_region),
+        )
+
+    def _update_board(self, image: Optional[np.ndarray] = None):
+        """
+        Capture the current game board and update internal field states
+        using the decoder selected at construction.
+
+        :param image: Already captured board image (BGRA), grabbed from screen if None
+        """
+        if self.decoder == "pixel":
+            self._update_board_pixel()
+        else:
+            self._update_board_numpy(image)
+
+    def _update_board_numpy(self, image: Optional[np.ndarray] = None):
+        """
+        Capture the current game board and decode all fields in one vectorized pass.
+
+        The screenshot buffer is wrapped as a NumPy array without copying and classified
+        by `BoardDecoder`; only fields that are still undiscovered get updated.
+
+        :param image: Already captured board image (BGRA), grabbed from screen if None
+        """
+        if self.capture_mode == "dirty" and self._dirty_fields is not None:
+            self._update_dirty_rect()
+            return
+
+        if image is None:
+            image = self._grab(self.board_region)
+        codes = self.board_decoder.decode(image)
+        ids = list(self.undiscovered)
+        self._apply_codes(ids, codes[ids])
 
-        for row in self.board:
-            for field in row:
-                field.value = undiscovered_val
+        if self.capture_mode == "dirty":
+            self._dirty_fields = set()
 
-    def _update_board(self):
+    def _update_dirty_rect(self):
         """
-        Capture the current game board and update internal field states.
+        Capture and decode only the bounding rectangle of the fields clicked since the last update.
+
+        The rectangle is padded by one field, since revealing an empty field also opens its
+        neighbours. If an empty field shows up on the rectangle's edge the flood fill may have
+        spread past it, so the update escalates to a full board grab.
+        """
+        if not self._dirty_fields:
+            return
+
+        dirty = np.fromiter(self._dirty_fields, dtype=np.intp)
+        dirty_rows, dirty_cols = np.divmod(dirty, self.columns)
+        row_start, row_stop = max(int(dirty_rows.min()) - 1, 0), min(int(dirty_rows.max()) + 2, self.rows)
+        col_start, col_stop = max(int(dirty_cols.min()) - 1, 0), min(int(dirty_cols.max()) + 2, self.columns)
+
+        region = {
+            "left": self.board_region["left"] + col_start * self.FIELD_DIAMETER,
+            "top": self.board_region["top"] + row_start * self.FIELD_DIAMETER,
+            "width": (col_stop - col_start) * self.FIELD_DIAMETER,
+            "height": (row_stop - row_start) * self.FIELD_DIAMETER,
+        }
+        ids = (
+            np.arange(row_start, row_stop)[:, None] * self.columns + np.arange(col_start, col_stop)[None, :]
+        ).ravel()
+        codes = self.board_decoder.decode(
+            self._grab(region),
+            ids,
+            offset=Point(col_start * self.FIELD_DIAMETER, row_start * self.FIELD_DIAMETER),
+        )
+
+        changed = self._apply_codes(ids, codes)
+        if not changed:
+            # The website has not drawn the click yet, keep the fields dirty
+            return
+
+        self._dirty_fields = set()
+        for field in changed:
+            if field.value != FieldValue.EMPTY:
+                continue
+
+            row, col = divmod(field.id, self.columns)
+            if (
+                    (row == row_start and row_start > 0)
+                    or (row == row_stop - 1 and row_stop < self.rows)
+                    or (col == col_start and col_start > 0)
+                    or (col == col_stop - 1 and col_stop < self.columns)
+            ):
+                codes = self.board_decoder.decode(self._grab(self.board_region))
+                ids = list(self.undiscovered)
+                self._apply_codes(ids, codes[ids])
+                return
+
+    def _apply_codes(self, ids, codes: np.ndarray) -> list[Field]:
+        """
+        Write decoded codes into the fields that are still undiscovered.
+
+        :param ids: Field ids, aligned with `codes`
+        :param codes: FieldValue codes returned by `BoardDecoder.decode`
+        :return: The fields whose value changed
+        """
+        ids = np.asarray(ids, dtype=np.intp)
+        undiscovered_code = FieldValue.UNDISCOVERED.value
+        update = (self.values[ids] == undiscovered_code) & (codes != undiscovered_code)
+        return self._set_values(ids[update], codes[update])
+
+    def _update_board_pixel(self):
+        """
+        Capture the current game board and update internal field states pixel by pixel.
 
         This method:
         1. Takes a screenshot of the board region
@@ -353,35 +507,30 @@ class MineSweeperSolver:
         - Edge color to see if field is still undiscovered
         - Center color to determine the number or if it's empty
         """
-        screenshot = self.sct.grab(self.board_region)
+        if isinstance(self.capture, MssBackend):
+            # Sample the raw mss screenshot, the path the numpy decoder is benchmarked against
+            screenshot = self.capture.grab_screenshot(self.board_region)
+            self.captured_bytes += len(screenshot.raw)
+            pixel = screenshot.pixel
+        else:
+            image = self._grab(self.board_region)
+            pixel = lambda x, y: self._pixel(image, Point(x, y))
         # Optional: Save screenshot for debugging
-        # mss.tools.to_png(board_screenshot.rgb, board_screenshot.size, output="screenshot.png")
-
-        undiscovered = [
-            field for row in self.board
-            for field in row
-            if field.value == FieldValue.UNDISCOVERED
-        ]
+        # mss.tools.to_png(screenshot.rgb, screenshot.size, output="screenshot.png")
 
-        for field in undiscovered:
+        for field in list(self.undiscovered.values()):
             # Check the upper edge color to see if field is still covered
-            border_color = screenshot.pixel(
-                field.pos_to_board.x,
-                field.pos_to_board.y - self.FIELD_BORDER_OFFSET
-            )
+            border_color = pixel(field.pos_to_board.x, field.pos_to_board.y - self.FIELD_BORDER_OFFSET)
 
             # If edge is still white/undiscovered color, skip this field
             if self.COLOR_MAP.get(border_color, None) == FieldValue.UNDISCOVERED:
                 continue
 
-            center_color = screenshot.pixel(
-                field.pos_to_board.x,
-                field.pos_to_board.y
-            )
+            center_color = pixel(*field.pos_to_board)
 
-            field.value = self.COLOR_MAP.get(center_color, FieldValue.EMPTY)
+            self._set_value(field, self.COLOR_MAP.get(center_color, FieldValue.EMPTY))
 
-    def check_game_status(self) -> Literal['win', 'loss', 'ongoing']:
+    def check_game_status(self, image: Optional[np.ndarray] = None) -> Literal['win', 'loss', 'ongoing']:
         """
         Determine the current game state by analyzing the smiley button.
 
@@ -394,180 +543,175 @@ class MineSweeperSolver:
         - Dead: Check mouth corner for black pixel
         - Cool: Check glasses center for black pixel
 
+        :param image: Already captured smiley image (BGRA), grabbed from screen if None
         :return: 'won' if game is won, 'lost' if hit a mine, 'ongoing' if still playing
         """
-        screenshot = self.sct.grab(self.smiley_region)
+        if image is None:
+            image = self._grab(self.smiley_region)
 
-        if screenshot.pixel(*self.DEAD_SMILEY_MOUTH_CORNER_POS) == self.BLACK:
+        if self._pixel(image, self.DEAD_SMILEY_MOUTH_CORNER_POS) == self.BLACK:
             return 'loss'
 
-        if screenshot.pixel(*self.COOL_SMILEY_GLASSES_CENTER_POS) == self.BLACK:
+        if self._pixel(image, self.COOL_SMILEY_GLASSES_CENTER_POS) == self.BLACK:
             return 'win'
 
         return 'ongoing'
 
-    def _log_game(self, game_id: int, game_result: Literal['win', 'loss'], game_duration: float):
-        """Record game result in history."""
-        self.game_history.append(
-            GameResult(
-                id=game_id,
-                result=game_result,
-                total_moves=self.moves_made,
-                time_played=game_duration
-            )
-        )
-
-    def create_stats(self, games_completed: int) -> dict[str, any]:
-        """
-        Compute and return summary statistics for all completed games.
-
-        Parameters
-        ----------
-        games_completed : int
-            Total number of games played in this run. Should match the size of `self.game_history`.
-
-        Returns
-        -------
-        dict[str, any]
-            Nested dictionary of aggregated statistics with the following structure:
-
-            "games_played" : int
-                Total number of games executed in this run.
-
-            "wins" : int
-                Number of games where the final result was a win.
-
-            "losses" : int
-                Number of games lost (games_played - wins).
-
-            "win_rate" : float
-                Fraction of games won over all games played.
-
-            "longest_win_streak" : int
-                Maximum consecutive wins in order of play.
-
-            "longest_loss_streak" : int
-                Maximum consecutive losses in order of play.
-
-            "moves" : dict
-                Movement-related metrics:
-                    "total_moves" : int
-                        Sum of all moves taken across all games.
-                    "avg_moves_win" : float
-                        Average number of moves required to win.
-                    "avg_moves_loss" : float
-                        Average number of moves required to lose.
-
-            "best_results" : dict
-                Individual notable outcomes:
-                    "least_moves_played_win" : int
-                        Fewest moves required in any winning game.
-                    "fastest_win_time" : float
-                        Shortest duration of a winning game (in seconds).
-
-            "timing" : dict
-                Execution time metrics:
-                    "total_time" : float
-                        Total time spent playing all games (seconds).
-                    "avg_timer_per_game_won" : float
-                        Average duration of games where the bot won (seconds).
-        """
-        wins = sum(1 for game in self.game_history if game.result == "win")
-        total_moves = sum(game.total_moves for game in self.game_history)
-        total_win_moves = sum(game.total_moves for game in self.game_history if game.result == "win")
-
-        losses = games_completed - wins
-        total_loss_moves = total_moves - total_win_moves
-
-        # Build streaks
-        streaks = [
-            (result, len(list(group)))
-            for result, group in groupby(game.result for game in self.game_history)
-        ]
-
-        max_win_streak = max((run for res, run in streaks if res == "win"), default=0)
-        max_loss_streak = max((run for res, run in streaks if res == "loss"), default=0)
-
-        # Time Calculations
-        total_time = sum(game.time_played for game in self.game_history)
-        avg_timer_per_game_won = round(
-            sum(
-                game.time_played for game in self.game_history if game.result == 'win'
-            ) / wins,
-            ndigits=3
-        ) if wins > 0 else None
-
-        fastest_win_time = min(
-            (game.time_played for game in self.game_history if game.result == 'win'),
-            default=None
-        )
-        fastest_win_time = round(fastest_win_time, 3) if fastest_win_time is not None else None
-
-        stats = {
-            "games_played": games_completed,
-            "wins": wins,
-            "losses": losses,
-            "win_rate": wins / games_completed,
-            "longest_win_streak": max_win_streak,
-            "longest_loss_streak": max_loss_streak,
-
-            "moves": {
-                "total_moves": total_moves,
-                "avg_moves_win": round(total_win_moves / wins if wins else 0, 3),
-                "avg_moves_loss": round(total_loss_moves / losses if losses else 0, 3),
-            },
-
-            "best_results": {
-                "least_moves_played_win": self.best_win_moves,
-                "fastest_win_time": fastest_win_time,
-            },
-
-            "timing": {
-                "total_time": round(total_time, 3),
-                "avg_timer_per_game_won": avg_timer_per_game_won,
-            },
-        }
-
-        return stats
+    @staticmethod
+    def _pixel(image: np.ndarray, pos: Point) -> tuple[int, int, int]:
+        """Return the RGB color at `pos` of a BGRA image, like `ScreenShot.pixel()`."""
+        b, g, r = image[pos.y, pos.x, :3].tolist()
+        return r, g, b
 
     # --- Utility Methods ---
     def click_field(self, field: Field) -> None:
         """Execute left-click on the specified field."""
         self.moves_made += 1
+        if self._dirty_fields is not None and field.value == FieldValue.UNDISCOVERED:
+            self._dirty_fields.add(field.id)
         mouse.move(*field.pos_to_screen)
         mouse.click()
 
     def toggle_flag(self, field: Field) -> None:
         """Toggle flag on the specified field via right-click."""
         self.moves_made += 1
-        field.value = (
+        self._set_value(
+            field,
             FieldValue.FLAGGED if field.value != FieldValue.FLAGGED
             else FieldValue.UNDISCOVERED
         )
         mouse.move(*field.pos_to_screen)
         mouse.click(RIGHT)
 
+    def _locate_game_elements(
+            self,
+            size: tuple[int, int, int],
+            use_cache: bool,
+    ) -> tuple[Optional[Point], Optional[Point]]:
+        """
+        Find the top left field and the smiley on screen.
+
+        Cached geometry is validated with a few pixel probes and used if it still matches,
+        otherwise both templates are searched in a single grab of all monitors and the
+        result is written back to the cache.
+
+        :param size: Board dimensions (columns, rows, mines), part of the cache key
+        :param use_cache: Whether to read and write the calibration cache
+        :return: Tuple of (origin field position, smiley position), None for elements not found
+        """
+        key = calibration.layout_key(self.capture.monitors[1:], size)
+        if use_cache:
+            cached = calibration.load_geometry(key)
+            if cached is not None and all(
+                    self._probe_template(name, pos)
+                    for name, pos in zip(('first_field', 'happy_smiley'), cached)
+            ):
+                return cached
+
+        screen_region = self.capture.monitors[0]
+        screen = cvtColor(self._grab(screen_region), COLOR_BGRA2BGR)
+        origin_field_pos = self._locate_image('first_field', screen, screen_region)
+        smiley_pos = self._locate_image('happy_smiley', screen, screen_region)
+
+        if use_cache and origin_field_pos and smiley_pos:
+            calibration.save_geometry(key, origin_field_pos, smiley_pos)
+
+        return origin_field_pos, smiley_pos
+
+    def _probe_template(
+            self,
+            image_name: Literal['cool_smiley', 'dead_smiley', 'first_field', 'happy_smiley'],
+            center: Point,
+    ) -> bool:
+        """
+        Check whether a template is still shown at `center` by comparing a few pixels.
+
+        :param image_name: Name of image file (without .png extension)
+        :param center: Expected screen position of the template's center
+        :return: True if all probe pixels match the template
+        """
+        template = self._load_template(image_name)
+        height, width = template.shape[:2]
+        region = {
+            "left": center.x - width // 2,
+            "top": center.y - height // 2,
+            "width": width,
+            "height": height,
+        }
+        try:
+            image = self._grab(region)
+        except mss.exception.ScreenShotError:
+            return False
+
+        probe_x, probe_y = np.array(self.CALIBRATION_PROBES).T * [[width - 1], [height - 1]] // 100
+        diff = np.abs(image[probe_y, probe_x, :3].astype(np.int16) - template[probe_y, probe_x])
+        return bool((diff <= self.CALIBRATION_PROBE_TOLERANCE).all())
+
     @staticmethod
+    def _load_template(
+            image_name: Literal['cool_smiley', 'dead_smiley', 'first_field', 'happy_smiley']
+    ) -> np.ndarray:
+        """Load a template image as BGR array (cached per image)."""
+        return load_template(image_name)
+
     def _locate_image(
+            self,
             image_name: Literal['cool_smiley', 'dead_smiley', 'first_field', 'happy_smiley'],
-            region: Optional[dict[str, int]] = None
+            screen: np.ndarray,
+            screen_region: dict[str, int],
+            pyramid: bool = True,
     ) -> Optional[Point]:
         """
-        Locate an image on screen using template matching.
+        Locate an image in a captured screen using OpenCV template matching.
+
+        With `pyramid` enabled the search runs on a half resolution copy first and is then
+        refined at full resolution in a small window around the coarse hit. If the coarse
+        search finds nothing the full resolution image is searched.
 
         Args:
             image_name: Name of image file (without .png extension)
-            region: Optional screen region to search within
+            screen: Captured screen as BGR array
+            screen_region: Region the screen was captured from, used to convert to screen coordinates
+            pyramid: Whether to search a downscaled copy first
 
         Returns:
-            Point coordinates of image center, or None if not found
+            Point screen coordinates of image center, or None if not found
         """
-        try:
-            image_path = str(IMAGE_DIR / f"{image_name}.png")
-            return locateCenterOnScreen(image_path, region=region)
-        except ImageNotFoundException:
+        template = self._load_template(image_name)
+        height, width = template.shape[:2]
+
+        top_left = None
+        if pyramid:
+            scores = matchTemplate(pyrDown(screen), pyrDown(template), TM_SQDIFF_NORMED)
+            coarse_score, _, (coarse_x, coarse_y), _ = minMaxLoc(scores)
+
+            if coarse_score <= self.COARSE_MATCH_THRESHOLD:
+                pad = self.PYRAMID_REFINE_PADDING
+                left = max(coarse_x * 2 - pad, 0)
+                top = max(coarse_y * 2 - pad, 0)
+                window = screen[top:top + height + 2 * pad, left:left + width + 2 * pad]
+                top_left = self._match(window, template)
+                if top_left is not None:
+                    top_left = Point(top_left.x + left, top_left.y + top)
+
+        if top_left is None:
+            top_left = self._match(screen, template)
+            if top_left is None:
+                return None
+
+        return Point(
+            screen_region["left"] + top_left.x + width // 2,
+            screen_region["top"] + top_left.y + height // 2
+        )
+
+    def _match(self, image: np.ndarray, template: np.ndarray) -> Optional[Point]:
+        """Return the top left corner of the best template match, or None if it is below the threshold."""
+        if image.shape[0] < template.shape[0] or image.shape[1] < template.shape[1]:
             return None
 
+        score, _, top_left, _ = minMaxLoc(matchTemplate(image, template, TM_SQDIFF_NORMED))
+        return Point(*top_left) if score <= self.MATCH_THRESHOLD else None
+
 
 if __name__ == '__main__':
     import random
@@ -578,10 +722,7 @@ if __name__ == '__main__':
 
     def next_move(solver: MineSweeperSolver):
         """Random move strategy for testing."""
-        undiscovered = [
-            field for row in solver.board for field in row
-            if field.value == FieldValue.UNDISCOVERED
-        ]
+        undiscovered = list(solver.undiscovered.values())
 
         if undiscovered:
             solver.click_field(random.choice(undiscovered))
@@ -1,7 +1,10 @@
 import time
 from dataclasses import dataclass
 from enum import Enum
-from typing import NamedTuple, Literal
+from typing import NamedTuple, Literal, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from gameState import GameState
 
 
 class Point(NamedTuple):
@@ -24,18 +27,51 @@ class FieldValue(Enum):
     EIGHT = 8
 
 
-@dataclass(slots=True)
+# FieldValue by code; UNDISCOVERED (-2) and FLAGGED (-1) sit at the end so negative codes index directly
+_VALUE_BY_CODE = tuple(FieldValue(code) for code in range(9)) + (FieldValue.UNDISCOVERED, FieldValue.FLAGGED)
+
+
 class Field:
     """
-    :param pos_to_screen: Pixel Position relative to screen (the center of the field)
-    :param pos_to_board: Position relative to the board
-    :param id: Field ID
-    :param value: Field Value (Undiscovered, Flagged, Empty, One, two ...)
+    Lightweight view of one field; the state lives in the arrays of the owning `GameState`.
+
+    Attributes:
+        pos_to_screen: Pixel Position relative to screen (the center of the field)
+        pos_to_board: Position relative to the board
+        id: Field ID
+        value: Field Value (Undiscovered, Flagged, Empty, One, two ...), assigning it goes
+            through the owner's `_set_value` so its indices stay in sync
     """
-    pos_to_screen: Point[int, int]
-    pos_to_board: Point[int, int]
-    id: int
-    value: FieldValue = FieldValue.UNDISCOVERED
+
+    __slots__ = ("_state", "id")
+
+    def __init__(self, state: "GameState", id: int) -> None:
+        """
+        :param state: Board owning the field
+        :param id: Field ID
+        """
+        self._state = state
+        self.id = id
+
+    @property
+    def value(self) -> FieldValue:
+        return _VALUE_BY_CODE[self._state.values.item(self.id)]
+
+    @value.setter
+    def value(self, value: FieldValue) -> None:
+        self._state._set_value(self, value)
+
+    @property
+    def pos_to_screen(self) -> Point[int, int]:
+        return Point(*self._state.screen_positions[self.id].tolist())
+
+    @property
+    def pos_to_board(self) -> Point[int, int]:
+        return Point(*self._state.board_positions[self.id].tolist())
+
+    def __repr__(self) -> str:
+        return f"Field(id={self.id}, value={self.value}, pos_to_screen={self.pos_to_screen})"
+
 
 @dataclass
 class GameResult:
@@ -0,0 +1,66 @@
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+
+
+@dataclass(frozen=True, slots=True)
+class NeighborTable:
+    """
+    8-neighborhoods of every field of one board geometry, keyed by `Field.id`.
+
+    The neighbors of field `i` are `indices[offsets[i]:offsets[i + 1]]` (CSR layout) for
+    vectorized code, or `of[i]` as a plain tuple for per-field Python loops. Neighbors are
+    listed in row-major order.
+
+    Attributes:
+        columns, rows: Board geometry the table was built for
+        offsets: int32 array of length `columns * rows + 1`
+        indices: Flat int32 array of neighbor field ids
+        of: Neighbor field ids per field
+    """
+    columns: int
+    rows: int
+    offsets: np.ndarray
+    indices: np.ndarray
+    of: tuple[tuple[int, ...], ...]
+
+
+@lru_cache(maxsize=None)
+def neighbor_table(columns: int, rows: int) -> NeighborTable:
+    """
+    Build the neighbor table of a board geometry, cached so every game of the same size shares it.
+
+    :param columns: Number of columns of the board
+    :param rows: Number of rows of the board
+    :return: Read-only `NeighborTable`
+    """
+    ids = np.arange(rows * columns).reshape(rows, columns)
+    padded = np.pad(ids, 1, constant_values=-1)
+
+    # Column k holds the neighbor in direction k for every field, -1 outside the board
+    candidates = np.stack([
+        padded[1 + dr:1 + dr + rows, 1 + dc:1 + dc + columns].ravel()
+        for dr in (-1, 0, 1)
+        for dc in (-1, 0, 1)
+        if (dr, dc) != (0, 0)
+    ], axis=1)
+    valid = candidates >= 0
+
+    offsets = np.zeros(rows * columns + 1, dtype=np.int32)
+    np.cumsum(valid.sum(axis=1), out=offsets[1:])
+    indices = candidates[valid].astype(np.int32)
+    offsets.flags.writeable = indices.flags.writeable = False
+
+    # Every neighbor tuple refers to one shared int per field id instead of its own copies,
+    # ids above 256 are separate objects and would take most of the table's memory
+    field_ids = list(range(rows * columns))
+    flat = [field_ids[neighbor] for neighbor in indices.tolist()]
+    bounds = offsets.tolist()
+    return NeighborTable(
+        columns=columns,
+        rows=rows,
+        offsets=offsets,
+        indices=indices,
+        of=tuple(tuple(flat[start:stop]) for start, stop in zip(bounds, bounds[1:])),
+    )
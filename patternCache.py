@@ -0,0 +1,109 @@
+from collections import OrderedDict
+from typing import Hashable, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from probability import Component
+
+# The 8 symmetries of the square grid as (row, column) -> (row', column')
+SYMMETRIES = (
+    lambda r, c: (r, c),
+    lambda r, c: (r, -c),
+    lambda r, c: (-r, c),
+    lambda r, c: (-r, -c),
+    lambda r, c: (c, r),
+    lambda r, c: (c, -r),
+    lambda r, c: (-c, r),
+    lambda r, c: (-c, -r),
+)
+
+
+def canonical_key(component: "Component", columns: int) -> tuple[Hashable, list[int]]:
+    """
+    Key of a component that is equal for every rotation, reflection and translation of it.
+
+    The constraint system only depends on which cells each number covers, so the key is
+    the sorted cell coordinates plus every constraint as (its sorted cell coordinates, mines),
+    taken under the symmetry giving the smallest key.
+
+    :param component: Frontier component
+    :param columns: Number of columns of the board, to turn field ids into coordinates
+    :return: The key and, per cell of the component, its index in canonical order
+    """
+    positions = [divmod(cell, columns) for cell in component.cells]
+
+    best = None
+    for symmetry in SYMMETRIES:
+        moved = [symmetry(row, col) for row, col in positions]
+        row_offset = min(row for row, _ in moved)
+        col_offset = min(col for _, col in moved)
+        moved = [(row - row_offset, col - col_offset) for row, col in moved]
+
+        order = sorted(range(len(moved)), key=moved.__getitem__)
+        rank = [0] * len(moved)
+        for canonical, cell in enumerate(order):
+            rank[cell] = canonical
+
+        key = (
+            tuple(moved[cell] for cell in order),
+            tuple(sorted((tuple(sorted(rank[cell] for cell in cells)), mines) for cells, mines in component.constraints)),
+        )
+        if best is None or key < best[0]:
+            best = (key, rank)
+
+    return best
+
+
+class PatternCache:
+    """
+    Bounded LRU cache of solved frontier components, keyed by `canonical_key`.
+
+    The same local shapes (1-2-1 walls, corners, ...) come up again and again across games,
+    so their solutions are stored once in canonical cell order and reused for every
+    rotated, reflected or shifted copy.
+
+    Attributes:
+        maxsize: Maximum number of cached patterns, the least recently used one is evicted first
+        hits, misses: Lookup counters
+    """
+
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, object] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[object]:
+        """Return the cached value of `key` (marking it recently used) or None."""
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value: object) -> None:
+        """Store a value, evicting the least recently used entry when full."""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, int | float]:
+        """Return size, capacity, hits, misses and the hit rate."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+        }
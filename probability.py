@@ -0,0 +1,714 @@
+import math
+import time
+from math import comb
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import cache
+from typing import Hashable, Optional, TYPE_CHECKING
+
+import numpy as np
+
+from gameState import GameState
+from models import FieldValue
+from patternCache import PatternCache, canonical_key
+
+if TYPE_CHECKING:
+    from componentPool import ComponentPool
+
+UNDISCOVERED_CODE = FieldValue.UNDISCOVERED.value
+FLAGGED_CODE = FieldValue.FLAGGED.value
+
+# Smaller components are enumerated faster than their canonical key is computed
+PATTERN_CACHE_MIN_CELLS = 6
+
+# Larger components are sampled instead of enumerated, enumeration time can explode beyond
+MAX_EXACT_CELLS = 80
+
+# Default wall-clock budget in seconds shared by all sampled components of one analysis
+SAMPLE_BUDGET = 0.05
+
+# Smaller components are enumerated in-process, shipping them to a `ComponentPool` costs more
+POOL_MIN_CELLS = 24
+
+# Backtracking steps between two deadline checks of `enumerate_component`
+DEADLINE_CHECK_INTERVAL = 512
+
+
+@dataclass(frozen=True, slots=True)
+class Constraint:
+    """
+    One revealed number: exactly `mines` of the undiscovered `cells` around it are mines.
+
+    Flags are trusted, so `mines` is the number minus the flags around it.
+    """
+    cells: tuple[int, ...]
+    mines: int
+
+
+@dataclass(slots=True)
+class Component:
+    """
+    Frontier cells connected through shared constraints, solvable independently of the others.
+
+    Attributes:
+        cells: Field ids of the component's undiscovered cells
+        constraints: Constraints over the cells, given as (indices into `cells`, mines)
+    """
+    cells: tuple[int, ...]
+    constraints: list[tuple[tuple[int, ...], int]]
+
+
+@dataclass(slots=True)
+class ComponentSolution:
+    """
+    All consistent mine assignments of one component, grouped by their number of mines.
+
+    Attributes:
+        cells: Field ids of the component's cells
+        counts: Number of consistent assignments per number of mines k
+        cell_counts: Per k, in how many of those assignments each cell (aligned with `cells`) is a mine
+        seconds: Time spent enumerating the component (or looking it up)
+        cached: Whether the solution came from a `PatternCache`
+        samples: For sampled solutions (see `sample_component`) the number of consistent samples
+            the counts consist of, None for exact solutions
+        standard_errors: For sampled solutions the standard error of each cell's mine
+            frequency (aligned with `cells`), None for exact solutions
+    """
+    cells: tuple[int, ...]
+    counts: dict[int, int]
+    cell_counts: dict[int, list[int]]
+    seconds: float
+    cached: bool = False
+    samples: Optional[int] = None
+    standard_errors: Optional[list[float]] = None
+
+    @property
+    def solutions(self) -> int:
+        return sum(self.counts.values())
+
+    def probabilities(self) -> dict[int, Fraction]:
+        """Mine probability per cell with every consistent assignment counted equally."""
+        total = self.solutions
+        per_cell = [sum(counts[i] for counts in self.cell_counts.values()) for i in range(len(self.cells))]
+        return {cell: Fraction(count, total) for cell, count in zip(self.cells, per_cell)}
+
+
+@dataclass(slots=True)
+class FrontierAnalysis:
+    """
+    Result of `analyze_frontier`.
+
+    Attributes:
+        components: Solution of every independent component
+        probabilities: Mine probability of every frontier cell, exact as a Fraction
+        interior: Undiscovered cells not touching any number
+        interior_probability: Mine probability of every interior cell, None without interior
+        mines_left: Mines not flagged yet
+        timings: Enumeration time of every component in seconds, aligned with `components`
+        standard_errors: Standard error of the probability of every sampled frontier cell,
+            empty when every component was enumerated exactly
+    """
+    components: list[ComponentSolution]
+    probabilities: dict[int, Fraction]
+    interior: list[int]
+    interior_probability: Optional[Fraction]
+    mines_left: int
+    timings: list[float]
+    standard_errors: dict[int, float]
+
+
+def frontier_constraints(game: GameState) -> list[Constraint]:
+    """Collect one constraint per revealed number that still borders an undiscovered field."""
+    values = game.values.tolist()
+    neighbors = game.neighbors.of
+
+    constraints = []
+    for field_id, code in enumerate(values):
+        if code <= 0:
+            continue
+
+        cells = []
+        flags = 0
+        for neighbor in neighbors[field_id]:
+            neighbor_code = values[neighbor]
+            if neighbor_code == UNDISCOVERED_CODE:
+                cells.append(neighbor)
+            elif neighbor_code == FLAGGED_CODE:
+                flags += 1
+
+        if cells:
+            constraints.append(Constraint(cells=tuple(cells), mines=code - flags))
+    return constraints
+
+
+def split_components(constraints: list[Constraint]) -> list[Component]:
+    """
+    Split the constraint graph into connected components with union-find.
+
+    Two cells are connected when a constraint covers both. Cells are ordered so that cells of
+    the same constraint are close together, which lets the backtracking prune early.
+    """
+    parent: dict[int, int] = {}
+
+    def find(cell: int) -> int:
+        root = cell
+        while parent[root] != root:
+            root = parent[root]
+        while parent[cell] != root:
+            parent[cell], cell = root, parent[cell]
+        return root
+
+    for constraint in constraints:
+        for cell in constraint.cells:
+            parent.setdefault(cell, cell)
+        first = find(constraint.cells[0])
+        for cell in constraint.cells[1:]:
+            root = find(cell)
+            if root != first:
+                parent[root] = first
+
+    grouped: dict[int, list[Constraint]] = {}
+    for constraint in constraints:
+        grouped.setdefault(find(constraint.cells[0]), []).append(constraint)
+
+    components = []
+    for group in grouped.values():
+        # Constraint order puts cells of one number next to each other
+        order: dict[int, int] = {}
+        for constraint in group:
+            for cell in constraint.cells:
+                order.setdefault(cell, len(order))
+        components.append(Component(
+            cells=tuple(order),
+            constraints=[(tuple(order[cell] for cell in constraint.cells), constraint.mines) for constraint in group],
+        ))
+    return components
+
+
+def enumerate_component(component: Component, deadline: Optional[float] = None) -> ComponentSolution:
+    """
+    Enumerate every consistent mine assignment of a component with backtracking.
+
+    Cells covered by exactly the same constraints are interchangeable, so they are merged
+    into groups and a group is assigned a number of mines m out of its g cells at once,
+    standing for C(g, m) assignments. After each step every constraint of the group is checked
+    to still be satisfiable (not too many mines, enough unassigned cells left), otherwise the
+    branch is cut.
+
+    :param component: Frontier component
+    :param deadline: `time.perf_counter()` value after which the enumeration is abandoned
+    :return: Assignment counts and per-cell mine counts grouped by number of mines
+    :raises TimeoutError: If the deadline passes before the enumeration is complete
+    """
+    start_time = time.perf_counter()
+
+    size = len(component.cells)
+    cell_constraints: list[list[int]] = [[] for _ in range(size)]
+    for index, (cells, _) in enumerate(component.constraints):
+        for cell in cells:
+            cell_constraints[cell].append(index)
+
+    groups: dict[tuple[int, ...], list[int]] = {}
+    for cell in range(size):
+        groups.setdefault(tuple(cell_constraints[cell]), []).append(cell)
+    group_constraints = list(groups)
+    group_cells = list(groups.values())
+    group_sizes = [len(cells) for cells in group_cells]
+
+    required = [mines for _, mines in component.constraints]
+    unassigned = [len(cells) for cells, _ in component.constraints]
+    assigned = [0] * len(required)
+
+    group_mines = [0] * len(group_cells)
+    counts: dict[int, int] = {}
+    group_counts: dict[int, list[int]] = {}
+
+    steps_until_check = DEADLINE_CHECK_INTERVAL
+
+    def assign(group: int, mines: int, weight: int) -> None:
+        nonlocal steps_until_check
+        if deadline is not None:
+            steps_until_check -= 1
+            if not steps_until_check:
+                steps_until_check = DEADLINE_CHECK_INTERVAL
+                if time.perf_counter() > deadline:
+                    raise TimeoutError("Enumeration deadline passed")
+
+        if group == len(group_cells):
+            counts[mines] = counts.get(mines, 0) + weight
+            per_group = group_counts.setdefault(mines, [0] * len(group_cells))
+            for index, group_mine_count in enumerate(group_mines):
+                if group_mine_count:
+                    # A given cell of the group is a mine in m / g of the group's C(g, m) choices
+                    per_group[index] += weight * group_mine_count // group_sizes[index]
+            return
+
+        group_size = group_sizes[group]
+        constraints = group_constraints[group]
+        for index in constraints:
+            unassigned[index] -= group_size
+
+        for group_mine_count in range(group_size + 1):
+            if all(
+                    0 <= required[index] - assigned[index] - group_mine_count <= unassigned[index]
+                    for index in constraints
+            ):
+                for index in constraints:
+                    assigned[index] += group_mine_count
+                group_mines[group] = group_mine_count
+                assign(group + 1, mines + group_mine_count, weight * comb(group_size, group_mine_count))
+                for index in constraints:
+                    assigned[index] -= group_mine_count
+
+        group_mines[group] = 0
+        for index in constraints:
+            unassigned[index] += group_size
+
+    assign(0, 0, 1)
+
+    cell_counts: dict[int, list[int]] = {}
+    for mines, per_group in group_counts.items():
+        per_cell = [0] * size
+        for cells, count in zip(group_cells, per_group):
+            for cell in cells:
+                per_cell[cell] = count
+        cell_counts[mines] = per_cell
+
+    return ComponentSolution(
+        cells=component.cells,
+        counts=counts,
+        cell_counts=cell_counts,
+        seconds=time.perf_counter() - start_time,
+    )
+
+
+def solve_component(
+        component: Component,
+        columns: int,
+        cache: Optional[PatternCache] = None,
+        deadline: Optional[float] = None,
+) -> ComponentSolution:
+    """
+    Enumerate a component, or reuse the solution of a congruent component from `cache`.
+
+    Cached solutions are stored in canonical cell order (see `patternCache.canonical_key`)
+    and mapped back to the cell order of the component.
+
+    :param component: Frontier component
+    :param columns: Number of columns of the board
+    :param cache: Pattern cache, enumerate every time if None
+    :param deadline: See `enumerate_component`
+    :raises TimeoutError: If the deadline passes before the enumeration is complete
+    """
+    if cache is None or len(component.cells) < PATTERN_CACHE_MIN_CELLS:
+        return enumerate_component(component, deadline)
+
+    start_time = time.perf_counter()
+    solution, key, rank = _cache_lookup(component, columns, cache)
+    if solution is None:
+        solution = enumerate_component(component, deadline)
+        _cache_store(cache, key, rank, solution)
+
+    solution.seconds = time.perf_counter() - start_time
+    return solution
+
+
+def _cache_lookup(
+        component: Component,
+        columns: int,
+        cache: PatternCache,
+) -> tuple[Optional[ComponentSolution], Hashable, list[int]]:
+    """Look a component up, returning its cached solution (or None), canonical key and rank."""
+    key, rank = canonical_key(component, columns)
+    cached = cache.get(key)
+    if cached is None:
+        return None, key, rank
+
+    counts, canonical_cell_counts = cached
+    solution = ComponentSolution(
+        cells=component.cells,
+        counts=dict(counts),
+        cell_counts={
+            mines: [per_cell[canonical] for canonical in rank]
+            for mines, per_cell in canonical_cell_counts.items()
+        },
+        seconds=0.0,
+        cached=True,
+    )
+    return solution, key, rank
+
+
+def _cache_store(cache: PatternCache, key: Hashable, rank: list[int], solution: ComponentSolution) -> None:
+    """Store a solution in canonical cell order."""
+    canonical_cell_counts = {}
+    for mines, per_cell in solution.cell_counts.items():
+        canonical = [0] * len(per_cell)
+        for cell, count in enumerate(per_cell):
+            canonical[rank[cell]] = count
+        canonical_cell_counts[mines] = canonical
+    cache.put(key, (dict(solution.counts), canonical_cell_counts))
+
+
+def sample_component(
+        component: Component,
+        budget: float,
+        mine_odds: Optional[Fraction] = None,
+        chains: int = 64,
+        beta: float = 2.0,
+        groups: int = 16,
+        burn_in: float = 0.1,
+        seed: Optional[int] = None,
+) -> ComponentSolution:
+    """
+    Estimate a component's solution by sampling mine assignments with Metropolis chains.
+
+    The energy of an assignment is the number of mines it is off over all constraints, so
+    the consistent assignments are exactly those with zero energy. Single-cell flips are
+    accepted with probability min(1, exp(-beta * energy change) * mine_odds ** mine change),
+    and only zero energy states are recorded. All chains run at once as NumPy arrays until
+    the wall-clock budget is spent.
+
+    Without `mine_odds` the recorded states are uniform over the consistent assignments.
+    The interior weighting of `combine_components` favours some mine counts by orders of
+    magnitude though, which uniform samples rarely reach. With `mine_odds` set to roughly
+    the board's mine odds the chains sample near the weighted distribution instead, and
+    every sample with k mines is recorded with the exact Fraction weight `mine_odds ** -k`
+    to undo the tilt.
+
+    The returned counts are weighted sample counts instead of solution counts.
+    `combine_components` only needs them up to a constant factor per component, so they
+    combine like exact solutions.
+
+    Standard errors come from the spread of the per-cell estimates (with the tilt undone)
+    between `groups` groups of chains. The chains are independent, so unlike batch means
+    over time the spread does not shrink with the autocorrelation within a chain. Samples
+    of the first `burn_in` share of the budget are dropped, while the chains still carry
+    their random start. The errors are those of the component on its own; the global
+    weighting of `combine_components` is close to the tilt but not identical to it.
+
+    :param component: Frontier component
+    :param budget: Wall-clock budget in seconds
+    :param mine_odds: Factor each additional mine changes a state's sampling weight by, 1 if None
+    :param chains: Number of chains simulated in parallel
+    :param beta: Inverse temperature, higher values reject constraint violations more strictly
+    :param groups: Number of independent groups of chains for the standard errors
+    :param burn_in: Share of the budget run before samples are recorded
+    :param seed: Seed of the chains
+    :return: Estimated solution, `samples` and `standard_errors` set. Without a single
+        consistent sample within the budget, `counts` is empty
+    """
+    start_time = time.perf_counter()
+    rng = np.random.default_rng(seed)
+
+    size = len(component.cells)
+    constraint_count = len(component.constraints)
+    required = np.array([mines for _, mines in component.constraints] + [0], dtype=np.int16)
+    log_odds = float(np.log(float(mine_odds))) if mine_odds else 0.0
+
+    # Constraints of every cell, padded with a dummy constraint that never counts
+    touched = np.full((size, 8), constraint_count, dtype=np.intp)
+    filled = [0] * size
+    for index, (cells, _) in enumerate(component.constraints):
+        for cell in cells:
+            touched[cell, filled[cell]] = index
+            filled[cell] += 1
+    real = touched < constraint_count
+
+    # Start near the mine density the constraints ask for
+    covered = sum(len(cells) for cells, _ in component.constraints)
+    density = min(max(float(required.sum()) / max(covered, 1), 0.05), 0.95)
+    state = (rng.random((chains, size)) < density).astype(np.int16)
+    sums = np.zeros((chains, constraint_count + 1), dtype=np.int16)
+    for index, (cells, _) in enumerate(component.constraints):
+        sums[:, index] = state[:, list(cells)].sum(axis=1)
+    energy = np.abs(sums - required).sum(axis=1)
+
+    chain_ids = np.arange(chains)
+    chain_groups = chain_ids * groups // chains
+    counts = np.zeros(size + 1, dtype=np.int64)
+    cell_counts = np.zeros((size + 1, size), dtype=np.int64)
+    steps_per_round = min(size, 32)
+
+    # Per group sums of the tilt-undoing weights, relative to the initial mine count to stay in range
+    reference_mines = round(density * size)
+    group_weights = np.zeros(groups)
+    group_cells = np.zeros((groups, size))
+
+    record_start = start_time + budget * burn_in
+    end_time = start_time + budget
+    while True:
+        now = time.perf_counter()
+        if now >= end_time:
+            break
+        recording = now >= record_start
+        for _ in range(steps_per_round):
+            flipped = rng.integers(size, size=chains)
+            change = 1 - 2 * state[chain_ids, flipped]
+            constraints = touched[flipped]
+            mask = real[flipped]
+            before = sums[chain_ids[:, None], constraints] - required[constraints]
+            energy_change = ((np.abs(before + change[:, None]) - np.abs(before)) * mask).sum(axis=1)
+
+            log_acceptance = log_odds * change - beta * energy_change
+            accepted = np.flatnonzero((log_acceptance >= 0) | (np.log(rng.random(chains)) < log_acceptance))
+            state[accepted, flipped[accepted]] += change[accepted]
+            sums[accepted[:, None], constraints[accepted]] += change[accepted, None] * mask[accepted]
+            energy[accepted] += energy_change[accepted]
+
+        if not recording:
+            continue
+        chosen = np.flatnonzero(energy == 0)
+        if chosen.size:
+            consistent = state[chosen]
+            mines = consistent.sum(axis=1)
+            np.add.at(counts, mines, 1)
+            np.add.at(cell_counts, mines, consistent)
+
+            weights = np.exp(np.clip(-log_odds * (mines - reference_mines), -600.0, 600.0))
+            np.add.at(group_weights, chain_groups[chosen], weights)
+            np.add.at(group_cells, chain_groups[chosen], consistent * weights[:, None])
+
+    sampled_groups = group_weights > 0
+    if sampled_groups.sum() >= 2:
+        estimates = group_cells[sampled_groups] / group_weights[sampled_groups, None]
+        standard_errors = (np.std(estimates, axis=0, ddof=1) / np.sqrt(len(estimates))).tolist()
+    else:
+        standard_errors = [float("inf")] * size
+
+    # Undo the tilt towards mine counts favoured by `mine_odds`, relative to the fewest mines seen
+    found = np.flatnonzero(counts).tolist()
+    weights = {mines: (1 / mine_odds) ** (mines - found[0]) if mine_odds else 1 for mines in found}
+    return ComponentSolution(
+        cells=component.cells,
+        counts={mines: int(counts[mines]) * weights[mines] for mines in found},
+        cell_counts={mines: [int(count) * weights[mines] for count in cell_counts[mines]] for mines in found},
+        seconds=time.perf_counter() - start_time,
+        samples=int(counts.sum()),
+        standard_errors=standard_errors,
+    )
+
+
+def _unconstrained_solution(solution: ComponentSolution) -> ComponentSolution:
+    """
+    Stand in for a sampled component without a single consistent sample.
+
+    Every assignment of the cells is counted as if no number touched them, so the combined
+    weighting gives them the interior probability and leaves the other components intact.
+    """
+    size = len(solution.cells)
+    return ComponentSolution(
+        cells=solution.cells,
+        counts={mines: comb(size, mines) for mines in range(size + 1)},
+        cell_counts={mines: [comb(size - 1, mines - 1) if mines else 0] * size for mines in range(size + 1)},
+        seconds=solution.seconds,
+        samples=0,
+        standard_errors=[float("inf")] * size,
+    )
+
+
+def _convolve(left: dict[int, int | Fraction], right: dict[int, int | Fraction]) -> dict[int, int | Fraction]:
+    """Distribution of the summed mine count of two independent parts, both given as counts by mines."""
+    combined: dict[int, int | Fraction] = {}
+    for left_mines, left_count in left.items():
+        for right_mines, right_count in right.items():
+            mines = left_mines + right_mines
+            combined[mines] = combined.get(mines, 0) + left_count * right_count
+    return combined
+
+
+def combine_components(
+        solutions: list[ComponentSolution],
+        interior: int,
+        mines_left: int,
+) -> tuple[dict[int, Fraction], Optional[Fraction]]:
+    """
+    Turn independent component solutions into exact board-wide mine probabilities.
+
+    Components only look independent: together with the interior they have to hold exactly
+    `mines_left` mines. A combination of component assignments with K mines in total leaves
+    `mines_left - K` mines for the interior, which can be placed in C(interior, mines_left - K)
+    ways, so every assignment is weighted by that binomial. The weights are exact integers,
+    Python ints do not overflow on expert boards.
+
+    Counts may also be Fractions, e.g. estimated counts of a sampled component.
+
+    :param solutions: Solution of every frontier component
+    :param interior: Number of undiscovered cells not touching any number
+    :param mines_left: Mines not flagged yet
+    :return: Mine probability per frontier cell and of every interior cell (None without interior)
+    :raises ValueError: If no assignment is consistent with the mine count
+    """
+    # Every (component mines, other mines) pair asks for a binomial, but only few distinct ones
+    @cache
+    def interior_ways(frontier_mines: int) -> int:
+        return comb(interior, mines_left - frontier_mines) if frontier_mines <= mines_left else 0
+
+    # Prefix and suffix convolutions give the distribution of all components except one
+    prefixes = [{0: 1}]
+    for solution in solutions:
+        prefixes.append(_convolve(prefixes[-1], solution.counts))
+    suffixes = [{0: 1}]
+    for solution in reversed(solutions):
+        suffixes.append(_convolve(suffixes[-1], solution.counts))
+    suffixes.reverse()
+
+    total = sum(count * interior_ways(mines) for mines, count in prefixes[-1].items())
+    if not total:
+        raise ValueError("No mine assignment is consistent with the board and the mine count")
+
+    probabilities: dict[int, Fraction] = {}
+    for index, solution in enumerate(solutions):
+        others = _convolve(prefixes[index], suffixes[index + 1])
+        per_cell = [0] * len(solution.cells)
+        for mines, cell_counts in solution.cell_counts.items():
+            weight = sum(count * interior_ways(mines + other_mines) for other_mines, count in others.items())
+            if weight:
+                for cell, cell_count in enumerate(cell_counts):
+                    per_cell[cell] += cell_count * weight
+        probabilities.update(
+            (cell, Fraction(count) / total) for cell, count in zip(solution.cells, per_cell)
+        )
+
+    interior_probability = None
+    if interior:
+        interior_mines = sum(
+            count * interior_ways(mines) * (mines_left - mines) for mines, count in prefixes[-1].items()
+        )
+        interior_probability = Fraction(interior_mines) / (total * interior)
+
+    return probabilities, interior_probability
+
+
+def analyze_frontier(
+        game: GameState,
+        cache: Optional[PatternCache] = None,
+        max_exact_cells: Optional[int] = MAX_EXACT_CELLS,
+        sample_budget: float = SAMPLE_BUDGET,
+        seed: Optional[int] = None,
+        deadline: Optional[float] = None,
+        pool: Optional["ComponentPool"] = None,
+) -> FrontierAnalysis:
+    """
+    Compute mine probabilities of every undiscovered field of a game's current board.
+
+    The frontier is split into independent components, each enumerated on its own, so the
+    cost grows with the largest component instead of the whole frontier. Components with
+    more than `max_exact_cells` cells, and components whose enumeration does not finish
+    within `sample_budget`, are sampled instead (see `sample_component`), so one analysis
+    takes about twice the budget at most on any board. The components are then weighted
+    by the number of ways the interior can hold the remaining mines (see `combine_components`).
+    A sampled component without a single consistent sample is treated like interior cells.
+
+    With a deadline, enumeration and sampling both stop at the deadline as well.
+
+    With a pool, components of at least `POOL_MIN_CELLS` cells that are not cached are
+    enumerated in its worker processes while the smaller ones are solved here.
+
+    :param game: Game to analyze
+    :param cache: Pattern cache for the components, defaults to the game's `pattern_cache`
+    :param max_exact_cells: Largest component enumerated exactly, None to never sample
+    :param sample_budget: Wall-clock budget in seconds for exact enumeration, and again for
+        sampling the components it did not finish. Infinite to only stop at the deadline
+    :param seed: Seed of the sampler
+    :param deadline: `time.perf_counter()` value the analysis has to finish by
+    :param pool: Worker pool for large components, created for the game's board size
+    :return: Per-component solutions and timings, frontier and interior probabilities
+    :raises ValueError: If the pool was created for another board size
+    """
+    if pool is not None:
+        if not pool.fits(game.columns, game.rows):
+            raise ValueError(f"Pool is for {pool.columns}x{pool.rows} boards, game is {game.columns}x{game.rows}")
+        pool.publish(game.values)
+
+    # Exact enumeration gets the sampling budget too, a component with too many solutions
+    # would otherwise stall the analysis
+    start_time = time.perf_counter()
+    enumeration_deadline = start_time + sample_budget if math.isfinite(sample_budget) else None
+    if deadline is not None:
+        enumeration_deadline = deadline if enumeration_deadline is None else min(enumeration_deadline, deadline)
+
+    constraints = frontier_constraints(game)
+    cache = cache if cache is not None else game.pattern_cache
+    components = split_components(constraints)
+    mines_left = game.total_mines - len(game.flagged)
+
+    solutions: list[Optional[ComponentSolution]] = [None] * len(components)
+    to_sample = []
+    pooled = []
+    # Hand the large components to the pool first, so the workers run while the rest is solved here
+    if pool is not None:
+        for index, component in enumerate(components):
+            size = len(component.cells)
+            if size < POOL_MIN_CELLS or (max_exact_cells is not None and size > max_exact_cells):
+                continue
+            solution, key, rank = _cache_lookup(component, game.columns, cache)
+            if solution is not None:
+                solutions[index] = solution
+                continue
+            pooled.append((index, key, rank, pool.submit(component, enumeration_deadline)))
+
+    pooled_indices = {index for index, *_ in pooled}
+    for index, component in enumerate(components):
+        if solutions[index] is not None or index in pooled_indices:
+            continue
+        if max_exact_cells is None or len(component.cells) <= max_exact_cells:
+            try:
+                solutions[index] = solve_component(component, game.columns, cache, enumeration_deadline)
+            except TimeoutError:
+                pass
+        if solutions[index] is None:
+            to_sample.append(index)
+
+    for index, key, rank, future in pooled:
+        try:
+            solution = future.result()
+        except TimeoutError:
+            to_sample.append(index)
+            continue
+        _cache_store(cache, key, rank, solution)
+        solutions[index] = solution
+    to_sample.sort()
+
+    if to_sample:
+        # Sampled components share the budget by size; the board's mine odds approximate how
+        # strongly the interior weighting favours each additional frontier mine
+        if deadline is not None:
+            sample_budget = min(sample_budget, max(deadline - time.perf_counter(), 0.0))
+        sampled_cells = sum(len(components[index].cells) for index in to_sample)
+        free_cells = len(game.undiscovered) - mines_left
+        mine_odds = Fraction(mines_left, free_cells) if mines_left > 0 and free_cells > 0 else None
+
+        for index in to_sample:
+            component = components[index]
+            solution = sample_component(
+                component, sample_budget * len(component.cells) / sampled_cells, mine_odds, seed=seed
+            )
+            solutions[index] = solution if solution.counts else _unconstrained_solution(solution)
+
+    frontier = {cell for solution in solutions for cell in solution.cells}
+    interior = [cell for cell in game.undiscovered if cell not in frontier]
+
+    try:
+        probabilities, interior_probability = combine_components(solutions, len(interior), mines_left)
+    except ValueError:
+        # No combination of the components fits the remaining mine count, e.g. after wrong
+        # flags; fall back to counting each component alone
+        probabilities = {}
+        for solution in solutions:
+            if solution.solutions:
+                probabilities.update(solution.probabilities())
+        interior_probability = None
+
+    return FrontierAnalysis(
+        components=solutions,
+        probabilities=probabilities,
+        interior=interior,
+        interior_probability=interior_probability,
+        mines_left=mines_left,
+        timings=[solution.seconds for solution in solutions],
+        standard_errors={
+            cell: error
+            for solution in solutions if solution.standard_errors is not None
+            for cell, error in zip(solution.cells, solution.standard_errors)
+        },
+    )
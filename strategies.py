@@ -0,0 +1,409 @@
+import random
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from bitboard import BitBoard, iter_bits
+from componentPool import ComponentPool
+from gameState import GameState
+from gaussianElimination import solve_frontier
+from models import FieldValue
+from probability import FrontierAnalysis, analyze_frontier
+
+UNDISCOVERED_CODE = FieldValue.UNDISCOVERED.value
+
+
+class PropagationStrategy:
+    """
+    Deterministic single-number constraint propagation, usable wherever `next_move` is.
+
+    Instead of rescanning the board every move, the strategy follows the game's `change_log`
+    and keeps a worklist of numbered fields whose neighborhood changed. For each of them it
+    applies the two basic rules:
+
+    - all mines around the number are flagged → every other undiscovered neighbor is safe
+    - undiscovered neighbors equal the number minus its flags → they are all mines
+
+    The strategy mirrors the board in a `BitBoard`, updated from the same `change_log`: the
+    unknown neighbors and flags of a number are one AND with its neighbor mask each.
+
+    Every move it can prove is made in the same call, so the screen solver does not need a
+    capture between provably safe clicks. Clicked fields are tracked as pending until the
+    board shows them revealed, which keeps the rules sound while the screen lags behind.
+    Only when nothing can be proven it clicks a random undiscovered field.
+
+    An instance keeps per-game state, so use one instance per game object. With a seed, the
+    random generator is reseeded from the seed and the game's `board_index` at the start of
+    every game, so the moves on a board do not depend on the games played before it.
+    """
+
+    def __init__(self, seed: Optional[int] = None) -> None:
+        """
+        :param seed: Seed of the random guesses
+        """
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self._game: Optional[GameState] = None
+        self._epoch = -1
+        self._cursor = 0
+        self._worklist: set[int] = set()
+        self._bitboard: Optional[BitBoard] = None
+        # Bit mask of clicked fields the board does not show revealed yet
+        self._pending = 0
+
+    def __call__(self, game: GameState) -> None:
+        """Make every move that follows from the current board, or one random guess."""
+        if game is not self._game or game.board_epoch != self._epoch:
+            self._start_game(game)
+
+        moves_before = game.moves_made
+        self._propagate(game)
+        if game.moves_made != moves_before:
+            return
+
+        if self._pending:
+            # The screen has not shown a safe click yet, clicking it again is harmless
+            game.click_field(game._fields[(self._pending & -self._pending).bit_length() - 1])
+            return
+
+        self._fallback(game)
+
+    def _fallback(self, game: GameState) -> None:
+        """Make a move when propagation proves nothing: click a random undiscovered field."""
+        candidates = list(game.undiscovered)
+        if candidates:
+            self._click(game, self.rng.choice(candidates))
+
+    def _click(self, game: GameState, field_id: int) -> None:
+        """Click a field and keep it pending until the board shows it revealed."""
+        self._pending |= 1 << field_id
+        game.click_field(game._fields[field_id])
+
+    def _start_game(self, game: GameState) -> None:
+        """Forget the previous game and queue every number already on the board."""
+        self._game = game
+        self._epoch = game.board_epoch
+        if self.seed is not None and game.board_index is not None:
+            self.rng.seed(f"{self.seed}/{game.board_index}")
+        self._pending = 0
+        self._cursor = len(game.change_log)
+        self._bitboard = BitBoard.from_state(game)
+        self._worklist = {field_id for field_id, code in enumerate(game.values.tolist()) if code > 0}
+
+    def _drain_changes(self, game: GameState) -> None:
+        """Queue the numbers around every field changed since the last call."""
+        values = game.values
+        bitboard = self._bitboard
+        log = game.change_log
+
+        changed = [(field_id, values.item(field_id)) for field_id in log[self._cursor:]]
+        self._cursor = len(log)
+        # Bring the bitboard up to date first, so the numbers around a field are read from the current board
+        for field_id, code in changed:
+            bitboard.set(field_id, code)
+
+        for field_id, code in changed:
+            if code != UNDISCOVERED_CODE:
+                self._pending &= ~(1 << field_id)
+            if code > 0:
+                self._worklist.add(field_id)
+            self._worklist.update(iter_bits(bitboard.numbers_around(field_id)))
+
+    def _propagate(self, game: GameState) -> None:
+        """Apply the basic rules until the worklist is empty."""
+        values = game.values
+        bitboard = self._bitboard
+        fields = game._fields
+
+        while True:
+            self._drain_changes(game)
+            if not self._worklist:
+                return
+
+            # Every safe field is open, the rest are mines and the game is won
+            if len(game.undiscovered) + len(game.flagged) == game.total_mines:
+                self._worklist.clear()
+                return
+
+            number = self._worklist.pop()
+            neighbors = bitboard.neighbor_mask(number)
+            unknown = neighbors & bitboard.undiscovered & ~self._pending
+            if not unknown:
+                continue
+
+            mines_left = values.item(number) - (neighbors & bitboard.flagged).bit_count()
+            if mines_left == 0:
+                for field_id in iter_bits(unknown):
+                    # An earlier click of this loop may have opened it with its flood fill
+                    if values.item(field_id) == UNDISCOVERED_CODE:
+                        self._click(game, field_id)
+            elif mines_left == unknown.bit_count():
+                for field_id in iter_bits(unknown):
+                    game.toggle_flag(fields[field_id])
+
+
+class EliminationStrategy(PropagationStrategy):
+    """
+    `PropagationStrategy` that reduces the frontier linear system before guessing.
+
+    When the basic rules stall, `gaussianElimination.solve_frontier` combines all numbers of
+    the frontier and every field it proves safe (or a mine) is clicked (or flagged) at once.
+    Only when elimination finds nothing either, a random field is clicked.
+    """
+
+    def _fallback(self, game: GameState) -> None:
+        if not self._eliminate(game):
+            super()._fallback(game)
+
+    def _eliminate(self, game: GameState) -> bool:
+        """Click every field elimination proves safe and flag every proven mine, return whether there was any."""
+        safe, mines = solve_frontier(game)
+        for cell in safe:
+            self._click(game, cell)
+        for cell in mines:
+            game.toggle_flag(game._fields[cell])
+        return bool(safe or mines)
+
+
+class EnumerationStrategy(PropagationStrategy):
+    """
+    `PropagationStrategy` that falls back to exact frontier enumeration instead of guessing blindly.
+
+    When the basic rules stall, `probability.analyze_frontier` enumerates every independent
+    frontier component and weights them with the remaining mine count. Fields that are safe
+    (or mines) with certainty are clicked (or flagged) all at once; otherwise the field with
+    the lowest exact mine probability is clicked. The analysis stops at `move_deadline`, with
+    components it could not enumerate in time sampled instead.
+
+    Attributes:
+        move_deadline: Time budget of one analysis in seconds
+        pool: Optional `ComponentPool` enumerating large components in parallel
+        last_analysis: Most recent `FrontierAnalysis`, with per-component enumeration times
+    """
+
+    def __init__(
+            self,
+            seed: Optional[int] = None,
+            pool: Optional[ComponentPool] = None,
+            move_deadline: float = 0.1,
+    ) -> None:
+        """
+        :param seed: Seed used to break ties between equally likely guesses
+        :param pool: Worker pool for large components, created for the size of the boards played
+        :param move_deadline: Time budget of one analysis in seconds
+        """
+        super().__init__(seed)
+        self.pool = pool
+        self.move_deadline = move_deadline
+        self.last_analysis: Optional[FrontierAnalysis] = None
+
+    def _fallback(self, game: GameState) -> None:
+        if not game.undiscovered:
+            return
+
+        analysis = self.last_analysis = analyze_frontier(
+            game,
+            seed=self.rng.getrandbits(32),
+            deadline=time.perf_counter() + self.move_deadline,
+            pool=self.pool,
+        )
+        self._play_analysis(game, analysis)
+
+    def _play_analysis(self, game: GameState, analysis: FrontierAnalysis) -> list[int]:
+        """
+        Make every certain move of an analysis, or click the field least likely to be a mine.
+
+        :return: Field ids clicked or flagged
+        """
+        # Sampled probabilities are estimates, a sampled 0 or 1 proves nothing
+        certain = {
+            cell: probability for cell, probability in analysis.probabilities.items()
+            if cell not in analysis.standard_errors
+        }
+        safe = [cell for cell, probability in certain.items() if not probability]
+        mines = [cell for cell, probability in certain.items() if probability == 1]
+        for cell in safe:
+            self._click(game, cell)
+        for cell in mines:
+            game.toggle_flag(game._fields[cell])
+        if safe or mines:
+            return safe + mines
+
+        # Interior fields all share one probability, compare it once instead of per field
+        lowest = min(analysis.probabilities.values(), default=None)
+        candidates = [cell for cell, probability in analysis.probabilities.items() if probability == lowest]
+        if analysis.interior:
+            interior_probability = analysis.interior_probability
+            if interior_probability is None:
+                expected_frontier_mines = sum(analysis.probabilities.values())
+                interior_probability = (analysis.mines_left - expected_frontier_mines) / len(analysis.interior)
+
+            if lowest is None or interior_probability < lowest:
+                candidates = analysis.interior
+            elif interior_probability == lowest:
+                candidates = candidates + analysis.interior
+
+        if not candidates:
+            # No component had a consistent sample within the budget
+            candidates = list(game.undiscovered)
+        cell = self.rng.choice(candidates)
+        self._click(game, cell)
+        return [cell]
+
+
+@dataclass(slots=True)
+class MoveRecord:
+    """
+    How `AnytimeStrategy` found one move.
+
+    Attributes:
+        tier: Tier that produced the move, one of `AnytimeStrategy.TIERS`
+        tier_seconds: Time spent in every tier that ran, in order
+        seconds: Total time of the call
+        deadline_missed: Whether the call ran past its deadline
+    """
+    tier: str
+    tier_seconds: dict[str, float]
+    seconds: float
+    deadline_missed: bool
+
+
+class AnytimeStrategy(EnumerationStrategy):
+    """
+    Strategy with a per-move deadline that degrades gracefully instead of stalling.
+
+    Every call runs progressively more expensive tiers and stops at the first that yields
+    a move:
+
+    1. propagation: single-number rules on the changed fields (`PropagationStrategy`)
+    2. pending: nothing new is proven and a safe field clicked before is not shown revealed
+       yet, so it is clicked again
+    3. elimination: Gaussian elimination over the frontier (`EliminationStrategy`)
+    4. enumeration: exact frontier enumeration with mine count weighting (`probability`),
+       within half of the time left
+    5. sampling: components whose enumeration did not finish in that time are sampled
+       with the other half
+    6. guess: the deadline passed before any analysis, a random undiscovered field
+
+    The last tier always produces a move, so a call never returns empty-handed; each
+    tier only starts while time is left. Which tier produced every move and how long each
+    tier took is recorded in `records`, aggregated in `summary()`.
+
+    Attributes:
+        move_deadline: Time budget per call in seconds
+        records: `MoveRecord` of the latest calls
+    """
+
+    TIERS = ("propagation", "pending", "elimination", "enumeration", "sampling", "guess")
+
+    def __init__(
+            self,
+            move_deadline: float = 0.1,
+            seed: Optional[int] = None,
+            keep_records: int = 100_000,
+            pool: Optional[ComponentPool] = None,
+    ) -> None:
+        """
+        :param move_deadline: Time budget per call in seconds
+        :param seed: Seed of the sampler and of the guesses
+        :param keep_records: Number of most recent `MoveRecord`s kept in `records`
+        :param pool: See `EnumerationStrategy`
+        """
+        super().__init__(seed, pool, move_deadline)
+        self.records: deque[MoveRecord] = deque(maxlen=keep_records)
+        self.tier_moves: dict[str, int] = dict.fromkeys(self.TIERS, 0)
+        self.tier_seconds: dict[str, float] = dict.fromkeys(self.TIERS, 0.0)
+        self._deadline = 0.0
+        self._tier: Optional[str] = None
+        self._timings: dict[str, float] = {}
+
+    def __call__(self, game: GameState) -> None:
+        start_time = time.perf_counter()
+        self._deadline = start_time + self.move_deadline
+        self._tier = None
+        self._timings = {}
+        moves_before = game.moves_made
+
+        super().__call__(game)
+
+        if game.moves_made == moves_before:
+            return
+        if self._tier is None:
+            # No tier ran, `PropagationStrategy` clicked a pending field again
+            self._tier = "pending"
+
+        end_time = time.perf_counter()
+        self.records.append(MoveRecord(
+            tier=self._tier,
+            tier_seconds=self._timings,
+            seconds=end_time - start_time,
+            deadline_missed=end_time > self._deadline,
+        ))
+        self.tier_moves[self._tier] += 1
+        for tier, seconds in self._timings.items():
+            self.tier_seconds[tier] += seconds
+
+    def _timed(self, tier: str, game: GameState, run: Callable[[], None]) -> bool:
+        """Run one tier, record its time and whether it made a move."""
+        moves_before = game.moves_made
+        start_time = time.perf_counter()
+        run()
+        self._timings[tier] = self._timings.get(tier, 0.0) + time.perf_counter() - start_time
+
+        if game.moves_made != moves_before:
+            self._tier = tier
+            return True
+        return False
+
+    def _propagate(self, game: GameState) -> None:
+        self._timed("propagation", game, lambda: PropagationStrategy._propagate(self, game))
+
+    def _fallback(self, game: GameState) -> None:
+        if not game.undiscovered:
+            return
+
+        if time.perf_counter() < self._deadline:
+            if self._timed("elimination", game, lambda: EliminationStrategy._eliminate(self, game)):
+                return
+
+        if time.perf_counter() < self._deadline:
+            analysis = None
+
+            def analyze() -> None:
+                nonlocal analysis
+                # Enumeration stops halfway to the deadline, so timed out components are
+                # sampled for the other half instead of being left without a single sample
+                analysis = self.last_analysis = analyze_frontier(
+                    game,
+                    max_exact_cells=None,
+                    sample_budget=(self._deadline - time.perf_counter()) / 2,
+                    seed=self.rng.getrandbits(32),
+                    deadline=self._deadline,
+                    pool=self.pool,
+                )
+
+            self._timed("enumeration", game, analyze)
+            sampled_seconds = sum(solution.seconds for solution in analysis.components if solution.samples is not None)
+            if sampled_seconds:
+                self._timings["enumeration"] -= sampled_seconds
+                self._timings["sampling"] = sampled_seconds
+
+            played = []
+            if self._timed("enumeration", game, lambda: played.extend(self._play_analysis(game, analysis))):
+                # Label the move by the component of the played field; the interior probability
+                # rests on every component, so an interior move counts as sampled if any one is
+                errors = analysis.standard_errors
+                if any(cell in errors or (errors and cell not in analysis.probabilities) for cell in played):
+                    self._tier = "sampling"
+                return
+
+        self._timed("guess", game, lambda: PropagationStrategy._fallback(self, game))
+
+    def summary(self) -> dict[str, dict[str, int | float]]:
+        """Moves produced and total seconds spent per tier, plus the number of missed deadlines."""
+        return {
+            "moves": dict(self.tier_moves),
+            "seconds": {tier: round(seconds, 3) for tier, seconds in self.tier_seconds.items()},
+            "deadline_missed": sum(record.deadline_missed for record in self.records),
+        }
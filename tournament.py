@@ -0,0 +1,199 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import cache
+from pathlib import Path
+from typing import Callable, Literal, Optional
+
+from boardCorpus import BoardCorpus
+from gameState import GameState
+from headlessEngine import HeadlessMineSweeper
+from models import GameResult
+from patternCache import PatternCache
+
+# Chunks each worker gets on average, more chunks balance uneven game lengths better
+CHUNKS_PER_WORKER = 16
+
+
+@dataclass
+class ChunkResult:
+    chunk: int
+    pid: int
+    game_history: list[GameResult]
+    best_win_moves: int
+    total_moves: int
+    seconds: float
+    pattern_cache: dict[str, int | float]
+
+
+# Pattern cache of the worker process, shared by all chunks the worker plays
+_pattern_cache: Optional[PatternCache] = None
+
+
+@cache
+def _open_corpus(corpus_path: Path) -> BoardCorpus:
+    """Map the corpus once per worker, the OS shares the pages between the workers."""
+    return BoardCorpus(corpus_path)
+
+
+def _play_chunk(
+        chunk: int,
+        strategy: Callable[[HeadlessMineSweeper], None],
+        size: tuple[int, int, int],
+        seed: int,
+        game_offset: int,
+        games: int,
+        corpus_path: Optional[Path],
+) -> ChunkResult:
+    """Play one contiguous range of seeded games in a worker process."""
+    global _pattern_cache
+    if _pattern_cache is None:
+        _pattern_cache = PatternCache()
+
+    corpus = _open_corpus(corpus_path) if corpus_path is not None else None
+    engine = HeadlessMineSweeper(custom=size, play_games=games, seed=seed, game_offset=game_offset, corpus=corpus)
+    engine.pattern_cache = _pattern_cache
+
+    start_time = time.perf_counter()
+    engine.start(strategy)
+    seconds = time.perf_counter() - start_time
+
+    return ChunkResult(
+        chunk=chunk,
+        pid=os.getpid(),
+        game_history=engine.game_history,
+        best_win_moves=engine.best_win_moves,
+        total_moves=engine.total_moves,
+        seconds=seconds,
+        pattern_cache=engine.pattern_cache.stats(),
+    )
+
+
+def run_tournament(
+        strategy: Callable[[HeadlessMineSweeper], None],
+        difficulty: Literal["beginner", "intermediate", "expert"] = "beginner",
+        custom: Optional[tuple[int, int, int]] = None,
+        games: int = 1000,
+        workers: Optional[int] = None,
+        seed: int = 0,
+        corpus: Optional[Path | str] = None,
+        chunk_games: Optional[int] = None,
+) -> dict[str, any]:
+    """
+    Evaluate a strategy on seeded headless games spread over a process pool.
+
+    The games are split into small contiguous chunks that idle workers pick up one after
+    another, so a worker that draws long games does not hold up the whole run. Game `i`
+    always gets the same board for the same seed (see `HeadlessMineSweeper`), whatever the
+    number of workers or the chunk size. The strategy must be picklable, i.e. a module
+    level function like `next_move` in `main.py`; every chunk gets its own copy of it.
+
+    Seeded strategies of `strategies.py` reseed their guesses on every board, so their
+    results do not depend on the chunking either, except where a move deadline cuts an
+    analysis short. Any other state a strategy carries from game to game starts over with
+    every chunk.
+
+    :param strategy: Callback with the same signature as `next_move` in `main.py`
+    :param difficulty: Game difficulty level
+    :param custom: Custom dimensions (columns, rows, mines) to override difficulty
+    :param games: Number of games to play
+    :param workers: Number of worker processes, defaults to the number of CPUs
+    :param seed: Seed of the board set
+    :param corpus: Path of a board corpus (see `boardCorpus.write_corpus`) to play instead of
+        generated boards, so every strategy is scored on the identical board set.
+        Overrides difficulty, custom and seed
+    :param chunk_games: Games per chunk, defaults to about `CHUNKS_PER_WORKER` chunks per worker
+    :return: Dictionary shaped like `GameState.create_stats`, plus
+        "workers": per worker process chunks, games, moves, seconds and throughput, and
+        "throughput": wall time and games per second of the whole run
+    :raises ValueError: If the corpus has fewer boards than games requested
+    """
+    corpus_path = Path(corpus) if corpus is not None else None
+    if corpus_path is not None:
+        board_corpus = BoardCorpus(corpus_path)
+        if games > len(board_corpus):
+            raise ValueError(f"Corpus has {len(board_corpus)} boards, {games} games requested")
+        size, seed = board_corpus.size, board_corpus.seed
+    else:
+        size = custom if custom else GameState.DIFFICULTY_TO_SIZE[difficulty]
+
+    workers = max(1, min(workers or os.cpu_count() or 1, games))
+    chunk_games = chunk_games or max(1, games // (workers * CHUNKS_PER_WORKER))
+
+    chunks = [
+        (chunk, strategy, size, seed, game_offset, min(chunk_games, games - game_offset), corpus_path)
+        for chunk, game_offset in enumerate(range(0, games, chunk_games))
+    ]
+
+    start_time = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Results come back in chunk order, whichever worker played them
+        results = list(pool.map(_play_chunk, *zip(*chunks)))
+    wall_time = time.perf_counter() - start_time
+
+    # Merge the chunks into one history, in game order
+    merged = GameState(*size)
+    for result in results:
+        for game in result.game_history:
+            merged.game_history.append(
+                GameResult(
+                    id=len(merged.game_history) + 1,
+                    result=game.result,
+                    total_moves=game.total_moves,
+                    time_played=game.time_played
+                )
+            )
+        merged.best_win_moves = min(merged.best_win_moves, result.best_win_moves)
+
+    stats = merged.create_stats(len(merged.game_history))
+
+    per_worker: dict[int, list[ChunkResult]] = {}
+    for result in results:
+        per_worker.setdefault(result.pid, []).append(result)
+
+    # Every worker has its own pattern cache, its counters grow with every chunk it plays
+    worker_caches = [
+        max(
+            (result.pattern_cache for result in worker_results),
+            key=lambda cache_stats: cache_stats["hits"] + cache_stats["misses"],
+        )
+        for worker_results in per_worker.values()
+    ]
+    hits = sum(cache_stats["hits"] for cache_stats in worker_caches)
+    misses = sum(cache_stats["misses"] for cache_stats in worker_caches)
+    stats["pattern_cache"] = {
+        "size": sum(cache_stats["size"] for cache_stats in worker_caches),
+        "maxsize": sum(cache_stats["maxsize"] for cache_stats in worker_caches),
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+    }
+
+    stats["workers"] = []
+    for pid, worker_results in per_worker.items():
+        worker_games = sum(len(result.game_history) for result in worker_results)
+        worker_moves = sum(result.total_moves for result in worker_results)
+        seconds = sum(result.seconds for result in worker_results)
+        stats["workers"].append({
+            "pid": pid,
+            "chunks": len(worker_results),
+            "games": worker_games,
+            "moves": worker_moves,
+            "seconds": round(seconds, 3),
+            "games_per_second": round(worker_games / seconds, 1) if seconds else None,
+            "moves_per_second": round(worker_moves / seconds, 1) if seconds else None,
+        })
+    stats["throughput"] = {
+        "wall_time": round(wall_time, 3),
+        "games_per_second": round(games / wall_time, 1) if wall_time else None,
+    }
+    return stats
+
+
+if __name__ == '__main__':
+    from rich.pretty import pprint
+
+    from main import next_move
+
+    pprint(run_tournament(next_move, difficulty="beginner", games=100_000), expand_all=True)